@@ -67,6 +67,8 @@ REM Build ChatCollect
     --hidden-import "websockets" ^
     --hidden-import "PyQt5" ^
     --hidden-import "aiohttp" ^
+    --hidden-import "watchdog.observers" ^
+    --hidden-import "numpy" ^
     "chatcollect_gui.py"
 
 echo.
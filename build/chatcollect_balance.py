@@ -0,0 +1,225 @@
+"""
+ChatCollect balance simulator (command line).
+
+Runs a Monte Carlo season of the loot economy with the rules from cmd_loot and
+cmd_use (see simulate_balance in chatcollect_gui.py) and prints the score
+spread, time to reach each rank, shiny/legendary rates and the effect of steals.
+The same simulator is on the Setup -> Balance tab.
+
+--check drives the real cmd_loot/cmd_use handlers against a temporary database
+and compares their outcomes with the vectorized simulator (z-tests); it exits
+non-zero if they disagree. Your real config and chatcollect_data.txt are never
+written.
+
+Usage:
+    python chatcollect_balance.py --players 2000 --hours 20 --wait 90
+    python chatcollect_balance.py --config my_profile.json --rush-every 60 --json
+    python chatcollect_balance.py --check --loots 100000
+"""
+import argparse
+import asyncio
+import copy
+import json
+import math
+import os
+import random
+import shutil
+import sys
+import tempfile
+
+import chatcollect_gui as cc
+from chatcollect_benchmark import FakeChannel, FakeClient, FakeContext
+
+# ============ AGREEMENT CHECK ============
+# Exaggerated odds so rare outcomes show up often enough to compare
+CHECK_CONFIG = {
+    "cooldown": 0,
+    "use_cooldown": 0,
+    "shiny_chance": 50,
+    "legendary_chance": 25,
+    "golden_chance": 0.1,
+    "ruined_chance": 0.1,
+    "steal_chance": 0.05,
+    "luck_per_point": 5,
+    "points": {"standard_min": 1, "standard_max": 6, "shiny": 10, "golden": 3,
+               "ruined": 0, "legendary": 5}
+}
+CHECK_PLAYERS = 50
+CHECK_LIMIT = 4.0   # |z| above this fails (a false alarm is ~1 in 15000 per test)
+
+class CollectingOverlay:
+    """Stands in for OverlayBroadcaster: keeps the loot events"""
+
+    def __init__(self):
+        self.events = []
+
+    def broadcast(self, message):
+        self.events.append(message)
+
+    def request_leaderboard(self, show):
+        pass
+
+def prepare_check_workspace(folder):
+    """Overlay folder with both pools and a drop_weights.json, so the shiny legendary share isn't trivial"""
+    overlay = os.path.join(folder, "overlay")
+    os.makedirs(os.path.join(overlay, "legendary"))
+    for i in range(8):
+        open(os.path.join(overlay, f"item_{i}.png"), "wb").close()
+    for i in range(3):
+        open(os.path.join(overlay, "legendary", f"relic_{i}.png"), "wb").close()
+    with open(os.path.join(overlay, cc.DROP_WEIGHTS_FILE), "w", encoding="utf-8") as f:
+        json.dump({"item_0.png": 4, "legendary/relic_0.png": 2}, f)
+    return os.path.join(folder, "chatcollect_data.txt"), overlay
+
+async def run_real_loots(loots, seed):
+    """Outcomes of the real handlers: per loot (luck, rarity, points, legendary, stolen)"""
+    random.seed(seed)
+    config = copy.deepcopy(cc.DEFAULT_CONFIG)
+    for key, value in CHECK_CONFIG.items():
+        if isinstance(value, dict):
+            config[key].update(value)
+        else:
+            config[key] = value
+
+    overlay = CollectingOverlay()
+    channel = FakeChannel("balance")
+    game = cc.ChannelGame("balance", config, cc.db, overlay, lambda msg: None)
+    game.client = FakeClient(channel)
+    names = [f"viewer{i}" for i in range(CHECK_PLAYERS)]
+    for name in names:
+        cc.db.get_or_create(name)
+        cc.db.set_score(name, 10 ** 9)   # Always enough points for !use
+
+    # Remember who the steal went to, so the thief's gain can be read back
+    thieves = []
+    random_other = cc.db.random_other
+
+    def recording_random_other(username):
+        thief = random_other(username)
+        thieves.append(thief)
+        return thief
+    cc.db.random_other = recording_random_other
+
+    outcomes = []
+    for _ in range(loots):
+        username = random.choice(names)
+        # Mixed luck: none, or up to ten points spent through !use
+        amount = random.choice((0, 0, 1, 3, 6, 10))
+        if amount:
+            await game.cmd_use(FakeContext(channel, username, f"!use {amount}"))
+        luck = cc.player_data[username]['luck']
+        before = dict((name, cc.player_data[name]['loot_score']) for name in names)
+        del thieves[:]
+        await game.cmd_loot(FakeContext(channel, username, "!loot"))
+
+        event = overlay.events[-1]
+        thief = thieves[0] if thieves else None
+        receiver = thief or username
+        points = cc.player_data[receiver]['loot_score'] - before[receiver]
+        outcomes.append((luck, cc.RARITIES.index(event["rarity"]), points, event["is_legendary"], thief is not None))
+    await cc.db.flush()
+    return outcomes, cc.LootRules(config)
+
+def proportion_z(hits_a, n_a, hits_b, n_b):
+    pooled = (hits_a + hits_b) / (n_a + n_b)
+    spread = math.sqrt(pooled * (1 - pooled) * (1.0 / n_a + 1.0 / n_b))
+    return 0.0 if spread == 0 else (hits_a / n_a - hits_b / n_b) / spread
+
+def mean_z(a, b):
+    """Welch z for two numpy arrays"""
+    spread = math.sqrt(a.var(ddof=1) / a.size + b.var(ddof=1) / b.size)
+    return 0.0 if spread == 0 else (a.mean() - b.mean()) / spread
+
+def run_check(loots, seed):
+    np = cc.np
+    workspace = tempfile.mkdtemp(prefix="chatcollect_balance_")
+    try:
+        db_path, overlay = prepare_check_workspace(workspace)
+        cc.init_managers(db_path, overlay)
+        outcomes, rules = asyncio.run(run_real_loots(loots, seed))
+        pool = cc.loot_pool()
+    finally:
+        if cc.asset_manager is not None:
+            cc.asset_manager.stop_watching()
+        shutil.rmtree(workspace, ignore_errors=True)
+
+    luck = np.array([o[0] for o in outcomes])
+    real_rarity = np.array([o[1] for o in outcomes])
+    real_points = np.array([o[2] for o in outcomes], dtype=float)
+    real_legendary = np.array([o[3] for o in outcomes])
+    real_steal = np.array([o[4] for o in outcomes])
+
+    # The simulator on the same luck values
+    rng = np.random.default_rng(seed)
+    sim_luck = np.tile(luck, 10)
+    sim_rarity, sim_points, sim_legendary, sim_steal = cc.roll_loot(rules, sim_luck, rng, *pool)
+
+    n_real, n_sim = luck.size, sim_luck.size
+    rows = []
+    for i, name in enumerate(cc.RARITIES):
+        rows.append((f"rarity {name}", (real_rarity == i).mean(), (sim_rarity == i).mean(),
+                     proportion_z(int((real_rarity == i).sum()), n_real, int((sim_rarity == i).sum()), n_sim)))
+    rows.append(("legendary", real_legendary.mean(), sim_legendary.mean(),
+                 proportion_z(int(real_legendary.sum()), n_real, int(sim_legendary.sum()), n_sim)))
+    rows.append(("stolen", real_steal.mean(), sim_steal.mean(),
+                 proportion_z(int(real_steal.sum()), n_real, int(sim_steal.sum()), n_sim)))
+    rows.append(("points per loot", real_points.mean(), sim_points.mean(),
+                 mean_z(real_points, sim_points.astype(float))))
+
+    print(f"Agreement check: {n_real} real cmd_loot calls vs {n_sim} simulated (seed {seed})")
+    print(f"{'':<18}{'real':>10}{'simulated':>12}{'z':>8}")
+    failed = []
+    for name, real, sim, z in rows:
+        flag = "" if abs(z) < CHECK_LIMIT else "  <-- MISMATCH"
+        print(f"{name:<18}{real:>10.4f}{sim:>12.4f}{z:>8.2f}{flag}")
+        if flag:
+            failed.append(name)
+    if failed:
+        print(f"❌ Simulator disagrees with cmd_loot: {', '.join(failed)}")
+        return 1
+    print("✅ Simulator agrees with cmd_loot")
+    return 0
+
+# ============ MAIN ============
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="ChatCollect loot economy simulator")
+    parser.add_argument("--config", default=cc.CONFIG_FILE, help="Config profile (default: chatcollect_config.json, else defaults)")
+    parser.add_argument("--players", type=int, default=1000, help="Simulated chatters")
+    parser.add_argument("--hours", type=float, default=20.0, help="Hours of streaming")
+    parser.add_argument("--wait", type=float, default=120.0, help="Average seconds a player waits after the cooldown")
+    parser.add_argument("--use-share", type=float, default=0.2, help="Fraction of players who !use before looting")
+    parser.add_argument("--use-amount", type=int, default=1, help="Points per !use")
+    parser.add_argument("--rush-every", type=float, default=0, help="Minutes between Rush Hours (0 = never)")
+    parser.add_argument("--rush-minutes", type=float, default=2, help="Rush Hour length")
+    parser.add_argument("--drive-every", type=float, default=0, help="Minutes between Loot Drives (0 = never)")
+    parser.add_argument("--drive-minutes", type=float, default=20, help="Loot Drive length")
+    parser.add_argument("--seed", type=int, default=None)
+    parser.add_argument("--json", action="store_true", help="Print the raw report as JSON")
+    parser.add_argument("--check", action="store_true", help="Compare the simulator with the real cmd_loot")
+    parser.add_argument("--loots", type=int, default=50000, help="Real loots for --check")
+    args = parser.parse_args(argv)
+
+    if cc.np is None:
+        print("❌ The balance simulator needs numpy (pip install numpy)")
+        return 1
+
+    if args.check:
+        return run_check(args.loots, 7 if args.seed is None else args.seed)
+
+    # Only the overlay folder is read (legendary pool for shinies)
+    cc.init_managers(db_path=None)
+    config = cc.load_profile(args.config)
+    report = cc.simulate_balance(
+        config, players=args.players, hours=args.hours, mean_wait=args.wait,
+        use_share=args.use_share, use_amount=args.use_amount,
+        rush_every=args.rush_every, rush_minutes=args.rush_minutes,
+        drive_every=args.drive_every, drive_minutes=args.drive_minutes,
+        seed=args.seed)
+    if args.json:
+        print(json.dumps(report, indent=2))
+    else:
+        print(cc.format_balance_report(report))
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,331 @@
+"""
+ChatCollect headless load test / benchmark.
+
+Drives a ChannelGame's command handlers with a simulated raid of chatters,
+connects local overlay clients to the websocket server and prints a JSON
+report (commands/s, handler latency percentiles, save durations, overlay lag).
+
+Runs fully offline against a temporary folder - your real config and
+chatcollect_data.txt are never written. No Qt event loop is started.
+
+Usage:
+    python chatcollect_benchmark.py --chatters 2000 --rate 40 --duration 30 --db-size 50000 --overlays 3
+    python chatcollect_benchmark.py --rate 0 --duration 10 --out bench_v1.5.0.json
+"""
+import argparse
+import asyncio
+import contextlib
+import copy
+import json
+import os
+import random
+import shutil
+import socket
+import sys
+import tempfile
+import time
+
+import websockets
+
+import chatcollect_gui as cc
+
+DEFAULT_MIX = "loot=85,use=5,contest=5,leaderboard=5"
+
+# ============ FAKE TWITCH CONTEXT ============
+class FakeAuthor:
+    def __init__(self, name):
+        self.name = name
+
+class FakeMessage:
+    def __init__(self, content):
+        self.content = content
+
+class FakeChannel:
+    """Stands in for twitchio's Channel: counts messages instead of sending them"""
+
+    def __init__(self, name):
+        self.name = name
+        self.sent = 0
+        self.lines = []
+
+    async def send(self, message):
+        self.sent += 1
+        self.lines.append(message)
+
+class FakeClient:
+    """Stands in for ChatCollectBot when the game looks up its channel"""
+
+    def __init__(self, channel):
+        self.channel = channel
+
+    def get_channel(self, name):
+        return self.channel
+
+class FakeContext:
+    """Stands in for twitchio's Context"""
+
+    def __init__(self, channel, username, content):
+        self.channel = channel
+        self.author = FakeAuthor(username)
+        self.message = FakeMessage(content)
+
+    async def send(self, message):
+        await self.channel.send(message)
+
+# ============ HELPERS ============
+def percentiles(values):
+    if not values:
+        return {"count": 0}
+    ordered = sorted(values)
+
+    def pick(p):
+        # Nearest-rank percentile
+        idx = max(0, min(len(ordered) - 1, int(round(p / 100.0 * len(ordered) + 0.5)) - 1))
+        return round(ordered[idx], 3)
+
+    return {
+        "count": len(ordered),
+        "mean": round(sum(ordered) / len(ordered), 3),
+        "p50": pick(50),
+        "p95": pick(95),
+        "p99": pick(99),
+        "max": round(ordered[-1], 3)
+    }
+
+def parse_mix(text):
+    mix = {}
+    for part in text.split(","):
+        name, _, weight = part.partition("=")
+        mix[name.strip()] = float(weight or 1)
+    unknown = set(mix) - {"loot", "use", "contest", "leaderboard"}
+    if unknown:
+        raise ValueError(f"Unknown commands in mix: {', '.join(sorted(unknown))}")
+    return mix
+
+def free_port():
+    with socket.socket(socket.AF_INET, socket.SOCK_STREAM) as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+def prepare_workspace(folder, db_size, item_count):
+    """Synthetic overlay folder and player database"""
+    overlay = os.path.join(folder, "overlay")
+    os.makedirs(os.path.join(overlay, "legendary"))
+    for i in range(item_count):
+        open(os.path.join(overlay, f"item_{i}.png"), "wb").close()
+    for i in range(max(1, item_count // 10)):
+        open(os.path.join(overlay, "legendary", f"relic_{i}.png"), "wb").close()
+
+    db_path = os.path.join(folder, "chatcollect_data.txt")
+    rng = random.Random(1234)
+    with open(db_path, "w", encoding="utf-8") as f:
+        f.write("# ChatCollect Player Database - benchmark fixture\n")
+        for i in range(db_size):
+            f.write(f"viewer{i} | {int(rng.paretovariate(1.2) * 10)} | 0.0 | 0.0 | 0.0 | 0 | 0\n")
+    return db_path, overlay
+
+def timed(func, bucket):
+    def wrapper(*args, **kwargs):
+        start = time.perf_counter()
+        try:
+            return func(*args, **kwargs)
+        finally:
+            bucket.append((time.perf_counter() - start) * 1000.0)
+    return wrapper
+
+# ============ OVERLAY CLIENTS ============
+async def overlay_client(uri, loot_sent_at, lags, received, ready):
+    async with websockets.connect(uri, max_size=None) as ws:
+        await ws.send("diff")
+        ready.set()
+        async for raw in ws:
+            now = time.perf_counter()
+            data = json.loads(raw)
+            received[data.get("event", "?")] = received.get(data.get("event", "?"), 0) + 1
+            if data.get("event") == "loot":
+                sent_at = loot_sent_at.get(data.get("user"))
+                if sent_at:
+                    lags.append((now - sent_at) * 1000.0)
+
+# ============ BENCHMARK ============
+async def run_benchmark(args):
+    workspace = tempfile.mkdtemp(prefix="chatcollect_bench_")
+    try:
+        db_path, overlay = prepare_workspace(workspace, args.db_size, args.items)
+        load_start = time.perf_counter()
+        cc.init_managers(db_path, overlay)
+        load_ms = (time.perf_counter() - load_start) * 1000.0
+
+        config = copy.deepcopy(cc.DEFAULT_CONFIG)
+        config.update({
+            "cooldown": args.cooldown,
+            "use_cooldown": args.cooldown,
+            "show_leaderboard": True,
+            "save_commit_window_ms": args.commit_window_ms,
+            "autosave_interval": 1
+        })
+        cc.configure_runtime(config)
+
+        journal_ms, compact_ms = [], []
+        cc.db.append_journal_blocking = timed(cc.db.append_journal_blocking, journal_ms)
+        cc.db.save_blocking = timed(cc.db.save_blocking, compact_ms)
+
+        watch_task = asyncio.ensure_future(cc.asset_manager.watch())
+
+        port = free_port()
+        server_task = asyncio.ensure_future(cc.start_overlay_server(host="127.0.0.1", port=port))
+        await asyncio.sleep(0.2)
+
+        # Handler finish time of each user's last loot, matched by the overlay clients
+        loot_sent_at = {}
+        lags = []
+        received = {}
+        client_tasks = []
+        for _ in range(args.overlays):
+            ready = asyncio.Event()
+            client_tasks.append(asyncio.ensure_future(
+                overlay_client(f"ws://127.0.0.1:{port}", loot_sent_at, lags, received, ready)))
+            await asyncio.wait_for(ready.wait(), timeout=5)
+
+        # The channel's game logic, without a Twitch connection
+        channel = FakeChannel("benchmark")
+        game = cc.ChannelGame("benchmark", config, cc.db, cc.overlay_broadcaster, lambda msg: None)
+        game.client = FakeClient(channel)
+        game.set_show_banner(True)
+        game.chat.configure(moderator=args.moderator)
+        chat_task = game.chat.start()
+        await game.start_contest(duration_minutes=max(1, args.duration // 60 + 1))
+
+        handlers = {
+            "loot": (game.cmd_loot, "!loot"),
+            "use": (game.cmd_use, "!use 1"),
+            "contest": (game.cmd_contest, "!contest"),
+            "leaderboard": (game.cmd_leaderboard, "!leaderboard")
+        }
+        mix = parse_mix(args.mix)
+        names = list(mix)
+        weights = [mix[n] for n in names]
+        chatters = [f"viewer{i}" for i in range(args.chatters)]
+        latencies = {name: [] for name in names}
+        errors = []
+        inflight = set()
+
+        async def dispatch(name, username):
+            func, content = handlers[name]
+            start = time.perf_counter()
+            try:
+                await func(FakeContext(channel, username, content))
+            except Exception as e:
+                errors.append(f"{name}: {e!r}")
+                return
+            end = time.perf_counter()
+            latencies[name].append((end - start) * 1000.0)
+            if name == "loot":
+                loot_sent_at[username] = end
+
+        rng = random.Random(args.seed)
+        random.seed(args.seed)
+        start = time.perf_counter()
+        deadline = start + args.duration
+        issued = 0
+        while time.perf_counter() < deadline:
+            name = rng.choices(names, weights)[0]
+            username = rng.choice(chatters)
+            issued += 1
+            if args.rate > 0:
+                # Open loop: Poisson arrivals, each command in its own task like twitchio
+                task = asyncio.ensure_future(dispatch(name, username))
+                inflight.add(task)
+                task.add_done_callback(inflight.discard)
+                await asyncio.sleep(rng.expovariate(args.rate))
+            else:
+                # Closed loop: as fast as the handlers allow
+                await dispatch(name, username)
+        if inflight:
+            await asyncio.gather(*inflight)
+        elapsed = time.perf_counter() - start
+
+        # Let overlays drain, then force a final compaction so it gets measured
+        await asyncio.sleep(max(1.0, args.commit_window_ms / 1000.0 * 2))
+        await cc.db.flush()
+
+        for task in client_tasks + [server_task, watch_task, chat_task]:
+            task.cancel()
+        await asyncio.gather(*client_tasks, server_task, watch_task, chat_task, return_exceptions=True)
+
+        all_latencies = [v for values in latencies.values() for v in values]
+        completed = len(all_latencies)
+        return {
+            "version": cc.CURRENT_VERSION,
+            "params": {
+                "chatters": args.chatters,
+                "rate": args.rate,
+                "duration_s": args.duration,
+                "db_size": args.db_size,
+                "overlays": args.overlays,
+                "items": args.items,
+                "mix": mix,
+                "cooldown": args.cooldown,
+                "commit_window_ms": args.commit_window_ms,
+                "moderator": args.moderator,
+                "seed": args.seed
+            },
+            "commands": {
+                "issued": issued,
+                "completed": completed,
+                "errors": len(errors),
+                "first_errors": errors[:5],
+                "elapsed_s": round(elapsed, 3),
+                "per_second": round(completed / elapsed, 2) if elapsed else 0.0
+            },
+            "latency_ms": dict({name: percentiles(values) for name, values in latencies.items()},
+                               all=percentiles(all_latencies)),
+            "chat": {
+                "sent": game.chat.sent,
+                "coalesced": game.chat.coalesced,
+                "expired": game.chat.expired,
+                "dropped": game.chat.dropped,
+                "pending": game.chat.pending(),
+                "sample": channel.lines
+            },
+            "save_ms": {
+                "initial_load": round(load_ms, 3),
+                "journal_commit": percentiles(journal_ms),
+                "compaction": percentiles(compact_ms)
+            },
+            "overlay": {
+                "clients": args.overlays,
+                "received": received,
+                "loot_lag_ms": percentiles(lags)
+            }
+        }
+    finally:
+        shutil.rmtree(workspace, ignore_errors=True)
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Headless ChatCollect load test")
+    parser.add_argument("--chatters", type=int, default=1000, help="Distinct simulated chatters")
+    parser.add_argument("--rate", type=float, default=20.0, help="Messages per second (0 = as fast as possible)")
+    parser.add_argument("--duration", type=int, default=20, help="Seconds of traffic")
+    parser.add_argument("--db-size", type=int, default=10000, help="Players pre-loaded in the database")
+    parser.add_argument("--overlays", type=int, default=3, help="Local overlay websocket clients")
+    parser.add_argument("--items", type=int, default=50, help="Normal item PNGs in the overlay folder")
+    parser.add_argument("--mix", default=DEFAULT_MIX, help=f"Command weights (default: {DEFAULT_MIX})")
+    parser.add_argument("--cooldown", type=int, default=60, help="Loot/use cooldown in seconds")
+    parser.add_argument("--moderator", action="store_true", help="Use the moderator chat rate limit")
+    parser.add_argument("--commit-window-ms", type=int, default=250, help="Database group commit window")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--out", help="Also write the JSON report to this file")
+    args = parser.parse_args(argv)
+
+    # Keep stdout clean JSON; the app's own prints go to stderr
+    with contextlib.redirect_stdout(sys.stderr):
+        report = asyncio.run(run_benchmark(args))
+    text = json.dumps(report, indent=2)
+    print(text)
+    if args.out:
+        with open(args.out, "w", encoding="utf-8") as f:
+            f.write(text + "\n")
+
+if __name__ == "__main__":
+    sys.exit(main())
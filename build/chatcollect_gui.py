@@ -1,18 +1,41 @@
+import argparse
 import asyncio
+import bisect
+import collections
+import copy
 import time
 import json
+import math
 import random
 import os
 import glob
 import sys
 import shutil
 import ctypes
+import errno
+import functools
 import urllib.request
 import subprocess
 import base64
 import webbrowser
-from ctypes import windll, byref, c_int
+from ctypes import byref, c_int
+try:
+    from ctypes import windll
+except ImportError:
+    # Not on Windows (e.g. headless benchmark runs); dark title bar is skipped
+    windll = None
+try:
+    from watchdog.observers import Observer
+except ImportError:
+    # Optional: without watchdog the overlay folder is polled for changes
+    Observer = None
+try:
+    import numpy as np
+except ImportError:
+    # Optional: only the balance simulator needs numpy
+    np = None
 from datetime import datetime
+from http import HTTPStatus
 from PyQt5.QtWidgets import (QApplication, QMainWindow, QWidget, QVBoxLayout, 
                              QHBoxLayout, QLabel, QLineEdit, QPushButton, 
                              QTextEdit, QGroupBox, QMessageBox, QComboBox, QGridLayout, QCheckBox, 
@@ -346,43 +369,83 @@ OVERLAY_HTML_CONTENT = r"""<!DOCTYPE html>
     </div>
 
     <script>
-        const ws = new WebSocket("ws://localhost:8765");
         const lootContainer = document.getElementById("loot-container");
         const notification = document.getElementById("notification");
         const leaderboard = document.getElementById("leaderboard");
         const leaderboardList = document.getElementById("leaderboard-list");
 
-        ws.onopen = () => {
-            console.log("✅ Connected to overlay server");
-            // Show visual confirmation
-            document.body.style.border = "5px solid lime";
-            setTimeout(() => { document.body.style.border = "none"; }, 2000);
-        };
-
-        ws.onmessage = (event) => {
-            const data = JSON.parse(event.data);
-            console.log("📩 Received:", data);
-
-            if (data.event === "loot") {
-                animateLoot(data);
-                if (data.show_banner) {
-                    showNotification(data);
+        let ws = null;
+        let reconnectDelay = 1000;
+        let boardRows = [];
+        let boardVersion = 0;
+
+        // Multi-channel servers: overlay.html?channel=<name>[&server=host:port]
+        const params = new URLSearchParams(window.location.search);
+        const overlayChannel = params.get("channel");
+        const overlayUrl = "ws://" + (params.get("server") || "localhost:8765") +
+            (overlayChannel ? "/" + encodeURIComponent(overlayChannel.toLowerCase()) : "");
+
+        function connect() {
+            ws = new WebSocket(overlayUrl);
+
+            ws.onopen = () => {
+                console.log("✅ Connected to overlay server");
+                reconnectDelay = 1000;
+                // Server sends a full leaderboard to every new connection,
+                // then diffs once we say we understand them
+                boardVersion = 0;
+                ws.send("diff");
+                // Show visual confirmation
+                document.body.style.border = "5px solid lime";
+                setTimeout(() => { document.body.style.border = "none"; }, 2000);
+            };
+
+            ws.onmessage = (event) => {
+                const data = JSON.parse(event.data);
+                console.log("📩 Received:", data);
+
+                if (data.event === "loot") {
+                    animateLoot(data);
+                    if (data.show_banner) {
+                        showNotification(data);
+                    }
+                } else if (data.event === "leaderboard_update") {
+                    boardRows = data.data;
+                    boardVersion = data.version || 0;
+                    updateLeaderboard(data.show);
+                } else if (data.event === "leaderboard_diff") {
+                    applyLeaderboardDiff(data);
                 }
-            } else if (data.event === "leaderboard_update") {
-                updateLeaderboard(data);
-            }
-        };
+            };
+
+            ws.onerror = (error) => {
+                console.error("❌ WebSocket error:", error);
+            };
 
-        ws.onerror = (error) => {
-            console.error("❌ WebSocket error:", error);
-        };
+            ws.onclose = () => {
+                console.log(`🔌 Disconnected from overlay server, retrying in ${reconnectDelay / 1000}s`);
+                setTimeout(connect, reconnectDelay);
+                reconnectDelay = Math.min(reconnectDelay * 2, 30000);
+            };
+        }
 
-        ws.onclose = () => {
-            console.log("🔌 Disconnected from overlay server");
-        };
+        connect();
 
-        function updateLeaderboard(data) {
-            if (data.show) {
+        function applyLeaderboardDiff(data) {
+            if (data.base !== boardVersion) {
+                // Missed an update; ask for a full copy
+                if (ws && ws.readyState === WebSocket.OPEN) ws.send("resync");
+                return;
+            }
+            const rows = boardRows.slice(0, data.size);
+            data.changed.forEach(player => { rows[player.rank - 1] = player; });
+            boardRows = rows;
+            boardVersion = data.version;
+            updateLeaderboard(data.show);
+        }
+
+        function updateLeaderboard(show) {
+            if (show) {
                 leaderboard.classList.remove("hidden");
             } else {
                 leaderboard.classList.add("hidden");
@@ -390,7 +453,7 @@ OVERLAY_HTML_CONTENT = r"""<!DOCTYPE html>
             }
 
             leaderboardList.innerHTML = "";
-            data.data.forEach(player => {
+            boardRows.forEach(player => {
                 const item = document.createElement("div");
                 item.className = "leaderboard-item";
                 
@@ -585,24 +648,362 @@ def ensure_initial_setup():
     except Exception as e:
         print(f"Failed to check/create default legendary item: {e}")
 
+# ============ METRICS ============
+METRICS_CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+class Histogram:
+    """Cumulative-bucket histogram (Prometheus style), values in seconds"""
+    __slots__ = ('buckets', 'counts', 'sum', 'count')
+
+    def __init__(self, buckets):
+        self.buckets = buckets
+        self.counts = [0] * (len(buckets) + 1)  # Last slot is +Inf
+        self.sum = 0.0
+        self.count = 0
+
+    def observe(self, value):
+        self.counts[bisect.bisect_left(self.buckets, value)] += 1
+        self.sum += value
+        self.count += 1
+
+    def quantile(self, q):
+        """Upper bound of the bucket holding the q-th observation (None if empty)"""
+        if not self.count:
+            return None
+        target = q * self.count
+        seen = 0
+        for bound, count in zip(self.buckets, self.counts):
+            seen += count
+            if seen >= target:
+                return bound
+        return float("inf")
+
+class Metrics:
+    """In-process counters, gauges and histograms, rendered as Prometheus text.
+
+    Cheap enough for the hot paths: an observation is a dict lookup and a
+    bisect. Updated from the bot loop and executor threads, read by the
+    /metrics endpoint and the GUI stats panel.
+    """
+    LATENCY_BUCKETS = (0.0001, 0.00025, 0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025,
+                       0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+    HELP = {
+        "chatcollect_command_duration_seconds": ("histogram", "Chat command handler time"),
+        "chatcollect_command_errors_total": ("counter", "Chat command handlers that raised"),
+        "chatcollect_db_load_seconds": ("histogram", "Player database load time (snapshot + journal replay)"),
+        "chatcollect_db_write_seconds": ("histogram", "Player database write time"),
+        "chatcollect_db_bytes_written_total": ("counter", "Bytes written to the player database files"),
+        "chatcollect_db_players": ("gauge", "Players in the database"),
+        "chatcollect_overlay_broadcast_seconds": ("histogram", "Time to queue one overlay event for every client"),
+        "chatcollect_overlay_clients": ("gauge", "Connected overlay clients"),
+        "chatcollect_overlay_messages_total": ("counter", "Overlay events broadcast"),
+        "chatcollect_overlay_dropped_total": ("counter", "Overlay events dropped for slow clients"),
+        "chatcollect_asset_scan_seconds": ("histogram", "Overlay folder scan time"),
+        "chatcollect_assets": ("gauge", "Indexed overlay items"),
+        "chatcollect_game_loop_lag_seconds": ("histogram", "How late the game loop woke up"),
+        "chatcollect_chat_send_seconds": ("histogram", "Time for one chat message send"),
+        "chatcollect_chat_messages_total": ("counter", "Outgoing chat messages by result"),
+        "chatcollect_chat_queue": ("gauge", "Chat messages waiting to be sent"),
+        "chatcollect_uptime_seconds": ("gauge", "Seconds since metrics were reset"),
+    }
+
+    def __init__(self):
+        self._histograms = {}  # (name, labels) -> Histogram
+        self._counters = {}    # (name, labels) -> float
+        self._gauges = {}      # (name, labels) -> float or callable
+        self.started = time.time()
+        self.set_gauge("chatcollect_uptime_seconds", lambda: time.time() - self.started)
+
+    @staticmethod
+    def _key(name, labels):
+        return name, tuple(sorted(labels.items()))
+
+    def observe(self, name, value, **labels):
+        key = self._key(name, labels)
+        histogram = self._histograms.get(key)
+        if histogram is None:
+            histogram = self._histograms.setdefault(key, Histogram(self.LATENCY_BUCKETS))
+        histogram.observe(value)
+
+    def inc(self, name, amount=1, **labels):
+        key = self._key(name, labels)
+        self._counters[key] = self._counters.get(key, 0) + amount
+
+    def set_gauge(self, name, value, **labels):
+        """value may be a number or a callable evaluated at read time"""
+        self._gauges[self._key(name, labels)] = value
+
+    def histogram(self, name, **labels):
+        return self._histograms.get(self._key(name, labels))
+
+    def counter(self, name, **labels):
+        return self._counters.get(self._key(name, labels), 0)
+
+    def gauge(self, name, **labels):
+        value = self._gauges.get(self._key(name, labels), 0)
+        return value() if callable(value) else value
+
+    def gauge_total(self, name):
+        """Sum of a gauge across all its label sets (e.g. every channel)"""
+        total = 0
+        for (gauge_name, labels), value in list(self._gauges.items()):
+            if gauge_name == name:
+                total += value() if callable(value) else value
+        return total
+
+    def time(self, name, **labels):
+        """with metrics.time("name", label=...): records the block's duration"""
+        return _Timer(self, name, labels)
+
+    @staticmethod
+    def _labels(labels, extra=None):
+        pairs = list(labels) + ([extra] if extra else [])
+        if not pairs:
+            return ""
+        escaped = []
+        for key, value in pairs:
+            value = str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+            escaped.append(f'{key}="{value}"')
+        return "{" + ",".join(escaped) + "}"
+
+    @staticmethod
+    def _number(value):
+        if value == float("inf"):
+            return "+Inf"
+        return repr(float(value)) if isinstance(value, float) else str(value)
+
+    def render(self):
+        """Prometheus text exposition format"""
+        series = {}
+        for (name, labels), value in list(self._counters.items()):
+            series.setdefault(name, []).append(f"{name}{self._labels(labels)} {self._number(value)}")
+        for (name, labels), value in list(self._gauges.items()):
+            try:
+                value = value() if callable(value) else value
+            except Exception:
+                continue
+            series.setdefault(name, []).append(f"{name}{self._labels(labels)} {self._number(value)}")
+        for (name, labels), histogram in list(self._histograms.items()):
+            lines = series.setdefault(name, [])
+            cumulative = 0
+            for bound, count in zip(histogram.buckets + (float("inf"),), list(histogram.counts)):
+                cumulative += count
+                lines.append(f"{name}_bucket{self._labels(labels, ('le', self._number(bound)))} {cumulative}")
+            lines.append(f"{name}_sum{self._labels(labels)} {self._number(histogram.sum)}")
+            lines.append(f"{name}_count{self._labels(labels)} {histogram.count}")
+
+        out = []
+        for name in sorted(series):
+            kind, text = self.HELP.get(name, ("untyped", ""))
+            out.append(f"# HELP {name} {text}")
+            out.append(f"# TYPE {name} {kind}")
+            out.extend(series[name])
+        return "\n".join(out) + "\n"
+
+class _Timer:
+    __slots__ = ('registry', 'name', 'labels', 'start')
+
+    def __init__(self, registry, name, labels):
+        self.registry = registry
+        self.name = name
+        self.labels = labels
+
+    def __enter__(self):
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc):
+        self.registry.observe(self.name, time.perf_counter() - self.start, **self.labels)
+        return False
+
+def timed_command(name):
+    """Decorator for bot command handlers: latency histogram + error counter"""
+    def decorator(func):
+        @functools.wraps(func)
+        async def wrapper(self, ctx, *args, **kwargs):
+            start = time.perf_counter()
+            try:
+                return await func(self, ctx, *args, **kwargs)
+            except Exception:
+                metrics.inc("chatcollect_command_errors_total", command=name)
+                raise
+            finally:
+                metrics.observe("chatcollect_command_duration_seconds", time.perf_counter() - start, command=name)
+        return wrapper
+    return decorator
+
+metrics = Metrics()
+
 # ============ OPTIMIZED MANAGERS ============
+FALLBACK_ITEMS = ("croissant.png", "donut.png", "Pancakes.png")
+DROP_WEIGHTS_FILE = "drop_weights.json"
+
+def _parse_item_name(filename):
+    """Convert filename to display name"""
+    # Handle paths like "legendary/cake.png" - get just the filename
+    name = os.path.basename(filename)
+    name = os.path.splitext(name)[0]
+    
+    # Case-insensitive removal of prefix
+    lower_name = name.lower()
+    if lower_name.startswith("legendary-") or lower_name.startswith("legendary_") or lower_name.startswith("legendary "):
+        name = name[10:]
+        
+    return name.replace("_", " ").replace("-", " ").strip().title()
+
+class AliasTable:
+    """Walker/Vose alias table: O(1) weighted picks after O(n) setup"""
+
+    def __init__(self, items, weights):
+        self.items = tuple(items)
+        n = len(self.items)
+        self._prob = [1.0] * n
+        self._alias = list(range(n))
+        total = float(sum(weights))
+        # Equal weights need no table; pick() degenerates to a uniform choice
+        self.uniform = n == 0 or total <= 0 or len(set(weights)) <= 1
+        if self.uniform:
+            return
+
+        scaled = [w * n / total for w in weights]
+        small = [i for i, p in enumerate(scaled) if p < 1.0]
+        large = [i for i, p in enumerate(scaled) if p >= 1.0]
+        while small and large:
+            s = small.pop()
+            l = large.pop()
+            self._prob[s] = scaled[s]
+            self._alias[s] = l
+            scaled[l] = (scaled[l] + scaled[s]) - 1.0
+            (small if scaled[l] < 1.0 else large).append(l)
+        # Leftovers are 1.0 up to float rounding
+        for i in small + large:
+            self._prob[i] = 1.0
+
+    def __len__(self):
+        return len(self.items)
+
+    def pick(self):
+        u = random.random() * len(self.items)
+        i = int(u)
+        if self.uniform or (u - i) < self._prob[i]:
+            return self.items[i]
+        return self.items[self._alias[i]]
+
+class AssetIndex:
+    """Immutable snapshot of the overlay folder; AssetManager swaps in a new one on change"""
+
+    def __init__(self, normal, legendary, weights=None):
+        weights = weights or {}
+        self.normal_items = list(normal)
+        self.legendary_items = list(legendary)
+        self.legendary_set = frozenset(self.legendary_items)
+        self.item_set = frozenset(self.normal_items) | self.legendary_set
+        self.names = {f: _parse_item_name(f) for f in self.item_set}
+
+        def weight_of(filename):
+            # Manifest keys may be "legendary/cake.png" or just "cake.png"
+            return weights.get(filename, weights.get(os.path.basename(filename), 1.0))
+
+        normal_weights = [weight_of(f) for f in self.normal_items]
+        legendary_weights = [weight_of(f) for f in self.legendary_items]
+        self.normal_table = AliasTable(self.normal_items, normal_weights)
+        self.legendary_table = AliasTable(self.legendary_items, legendary_weights)
+        self.all_table = AliasTable(self.normal_items + self.legendary_items,
+                                    normal_weights + legendary_weights)
+        # Chance that a shiny (drawn from both pools) is legendary
+        total_weight = sum(normal_weights) + sum(legendary_weights)
+        self.legendary_share = sum(legendary_weights) / total_weight if total_weight else 0.0
+
+class _AssetEventHandler:
+    """Forwards watchdog events (observer thread) to the asset manager's loop"""
+    # Reads (opened/closed, e.g. OBS loading a PNG or our own manifest read) change nothing
+    EVENT_TYPES = frozenset(("created", "deleted", "moved", "modified"))
+
+    def __init__(self, manager):
+        self.manager = manager
+
+    def dispatch(self, event):
+        if event.event_type in self.EVENT_TYPES:
+            self.manager.notify_changed()
+
 class AssetManager:
+    """Index of overlay PNGs.
+
+    Lookups never touch the disk. While the bot runs, watch() keeps the index
+    current from filesystem notifications (watchdog) and falls back to cheap
+    polling of the folder timestamps; rescans happen in an executor.
+    """
+    DEBOUNCE = 0.5        # Let bulk copies settle before rescanning
+    POLL_INTERVAL = 5     # Seconds between timestamp checks without notifications
+    WATCHED_POLL_INTERVAL = 60
+
     def __init__(self, folder):
         self.folder = folder
-        self._normal_items = []
-        self._legendary_items = []
         self._last_scan = 0
-        self._scan_interval = 60  # Cache for 60 seconds
+        self._scan_interval = 60  # Rescan interval when nothing is watching
+        self._signature = None
+        self._watching = False
+        self._observer = None
+        self._loop = None
+        self._changed = None
         self.refresh()
 
+    @property
+    def manifest_path(self):
+        return os.path.join(self.folder, DROP_WEIGHTS_FILE)
+
     def _scan_if_needed(self):
-        if time.time() - self._last_scan > self._scan_interval:
+        # Only used when watch() isn't running (GUI without the bot)
+        if not self._watching and time.time() - self._last_scan > self._scan_interval:
             self.refresh()
 
+    def _folder_signature(self):
+        """Directory and manifest timestamps - change when files are added, removed or renamed"""
+        signature = []
+        for path in (self.folder, os.path.join(self.folder, "legendary"), self.manifest_path):
+            try:
+                signature.append(os.stat(path).st_mtime_ns)
+            except OSError:
+                signature.append(None)
+        return tuple(signature)
+
+    def _load_weights(self):
+        """Optional drop_weights.json: {"donut.png": 3, "legendary/cake.png": 0.5}"""
+        if not os.path.exists(self.manifest_path):
+            return {}
+        try:
+            with open(self.manifest_path, "r", encoding="utf-8") as f:
+                raw = json.load(f)
+            if not isinstance(raw, dict):
+                raise ValueError("expected an object like {\"donut.png\": 3}")
+
+            weights = {}
+            for key, value in raw.items():
+                try:
+                    weight = float(value)
+                except (TypeError, ValueError):
+                    print(f"⚠️ Ignoring drop weight for {key}: {value!r}")
+                    continue
+                if weight > 0 and math.isfinite(weight):
+                    weights[key.replace("\\", "/")] = weight
+                else:
+                    print(f"⚠️ Ignoring drop weight for {key}: must be a number above 0")
+            return weights
+        except Exception as e:
+            print(f"⚠️ Error loading {DROP_WEIGHTS_FILE}: {e}")
+            return {}
+
     def refresh(self):
+        with metrics.time("chatcollect_asset_scan_seconds"):
+            self._scan()
+
+    def _scan(self):
+        signature = self._folder_signature()
         if not os.path.exists(self.folder):
-            self._normal_items = ["croissant.png", "donut.png", "Pancakes.png"]
-            self._legendary_items = []
+            self._index = AssetIndex(FALLBACK_ITEMS, [])
+            self._signature = signature
+            self._last_scan = time.time()
             return
 
         # 1. Scan Root Folder (Normal Items + Old Legendary)
@@ -614,14 +1015,14 @@ class AssetManager:
         if os.path.exists(legendary_folder):
             legendary_files = glob.glob(os.path.join(legendary_folder, "*.png"))
 
-        self._legendary_items = []
-        self._normal_items = []
+        legendary_items = []
+        normal_items = []
 
         # Process Subfolder Legendaries (Preferred)
         for f in legendary_files:
             filename = os.path.basename(f)
             # Use forward slash for web compatibility
-            self._legendary_items.append(f"legendary/{filename}")
+            legendary_items.append(f"legendary/{filename}")
 
         # Process Root Files
         for f in root_files:
@@ -630,165 +1031,740 @@ class AssetManager:
             
             # Backward compatibility for "Legendary-" prefix in root
             if lower_name.startswith("legendary-"):
-                self._legendary_items.append(filename)
+                legendary_items.append(filename)
             else:
-                self._normal_items.append(filename)
+                normal_items.append(filename)
         
         # Fallback if no normal items found
-        if not self._normal_items:
-            self._normal_items = ["croissant.png", "donut.png", "Pancakes.png"]
-        
+        if not normal_items:
+            normal_items = list(FALLBACK_ITEMS)
+
+        # Single attribute swap: readers on other threads see the old or new index, never a mix
+        self._index = AssetIndex(normal_items, legendary_items, self._load_weights())
+        self._signature = signature
         self._last_scan = time.time()
 
+    def refresh_if_changed(self):
+        if self._folder_signature() != self._signature:
+            self.refresh()
+            return True
+        return False
+
+    def notify_changed(self):
+        """Called from the watchdog thread"""
+        loop, changed = self._loop, self._changed
+        if loop is not None and changed is not None and not loop.is_closed():
+            loop.call_soon_threadsafe(changed.set)
+
+    def _start_observer(self):
+        if Observer is None or not os.path.isdir(self.folder):
+            return False
+        try:
+            observer = Observer()
+            observer.schedule(_AssetEventHandler(self), self.folder, recursive=True)
+            observer.daemon = True
+            observer.start()
+        except Exception as e:
+            print(f"⚠️ File notifications unavailable, polling overlay folder: {e}")
+            return False
+        self._observer = observer
+        return True
+
+    def stop_watching(self):
+        observer, self._observer = self._observer, None
+        if observer is not None:
+            observer.stop()
+        self._watching = False
+
+    async def watch(self):
+        """Keep the index current; runs for the lifetime of the bot loop"""
+        loop = asyncio.get_running_loop()
+        self._loop = loop
+        self._changed = asyncio.Event()
+        self._watching = True
+        self._start_observer()
+        try:
+            while True:
+                interval = self.WATCHED_POLL_INTERVAL if self._observer else self.POLL_INTERVAL
+                try:
+                    await asyncio.wait_for(self._changed.wait(), timeout=interval)
+                    await asyncio.sleep(self.DEBOUNCE)
+                except asyncio.TimeoutError:
+                    pass
+                self._changed.clear()
+                try:
+                    # Events that left the folder listing and manifest alone don't need a rescan
+                    await loop.run_in_executor(None, self.refresh_if_changed)
+                except Exception as e:
+                    print(f"⚠️ Error scanning overlay folder: {e}")
+        finally:
+            self.stop_watching()
+            self._loop = None
+            self._changed = None
+
     @property
     def normal_items(self):
         self._scan_if_needed()
-        return self._normal_items
+        return self._index.normal_items
 
     @property
     def legendary_items(self):
         self._scan_if_needed()
-        return self._legendary_items
+        return self._index.legendary_items
+
+    @property
+    def index(self):
+        self._scan_if_needed()
+        return self._index
+
+    def display_name(self, filename):
+        name = self._index.names.get(filename)
+        if name is None:
+            name = _parse_item_name(filename)
+        return name
+
+class _SkipNode:
+    __slots__ = ('key', 'next', 'width')
+
+    def __init__(self, key, levels):
+        self.key = key
+        self.next = [None] * levels
+        self.width = [1] * levels
+
+class RankingIndex:
+    """Players ordered by score (highest first) in an indexable skiplist.
+
+    Score changes, rank lookups and top-N reads are O(log n); picking a
+    random player is O(1).
+    """
+    MAX_LEVELS = 24
+
+    def __init__(self):
+        self.clear()
+
+    def clear(self):
+        self._head = _SkipNode(None, self.MAX_LEVELS)
+        self._keys = {}       # username -> (-score, username)
+        self._names = []      # flat list for O(1) random picks
+        self._positions = {}  # username -> index in _names
+
+    def __len__(self):
+        return len(self._keys)
+
+    def __contains__(self, username):
+        return username in self._keys
+
+    def _random_level(self):
+        level = 1
+        while level < self.MAX_LEVELS and random.random() < 0.5:
+            level += 1
+        return level
+
+    def _find_chain(self, key):
+        """Last node before key on every level, plus the distance walked per level"""
+        chain = [None] * self.MAX_LEVELS
+        steps = [0] * self.MAX_LEVELS
+        node = self._head
+        for level in range(self.MAX_LEVELS - 1, -1, -1):
+            nxt = node.next[level]
+            while nxt is not None and nxt.key < key:
+                steps[level] += node.width[level]
+                node = nxt
+                nxt = node.next[level]
+            chain[level] = node
+        return chain, steps
+
+    def _insert(self, key):
+        chain, steps_at_level = self._find_chain(key)
+        node = _SkipNode(key, self._random_level())
+        steps = 0
+        for level in range(len(node.next)):
+            prev = chain[level]
+            node.next[level] = prev.next[level]
+            prev.next[level] = node
+            node.width[level] = prev.width[level] - steps
+            prev.width[level] = steps + 1
+            steps += steps_at_level[level]
+        for level in range(len(node.next), self.MAX_LEVELS):
+            chain[level].width[level] += 1
+
+    def _remove(self, key):
+        chain, _ = self._find_chain(key)
+        node = chain[0].next[0]
+        if node is None or node.key != key:
+            raise KeyError(key)
+        for level in range(len(node.next)):
+            prev = chain[level]
+            prev.width[level] += node.width[level] - 1
+            prev.next[level] = node.next[level]
+        for level in range(len(node.next), self.MAX_LEVELS):
+            chain[level].width[level] -= 1
+
+    def rebuild(self, players):
+        """Bulk load in O(n log n) (one sort, then linear linking)"""
+        self.clear()
+        keys = sorted((-data['loot_score'], username) for username, data in players.items())
+        last = [self._head] * self.MAX_LEVELS
+        last_pos = [0] * self.MAX_LEVELS
+        for pos, key in enumerate(keys, 1):
+            node = _SkipNode(key, self._random_level())
+            for level in range(len(node.next)):
+                last[level].next[level] = node
+                last[level].width[level] = pos - last_pos[level]
+                last[level] = node
+                last_pos[level] = pos
+            username = key[1]
+            self._keys[username] = key
+            self._positions[username] = len(self._names)
+            self._names.append(username)
+        end = len(keys) + 1
+        for level in range(self.MAX_LEVELS):
+            last[level].width[level] = end - last_pos[level]
+
+    def update(self, username, score):
+        """Insert a player or move them to their new score"""
+        key = (-score, username)
+        old_key = self._keys.get(username)
+        if old_key == key:
+            return
+        if old_key is not None:
+            self._remove(old_key)
+        else:
+            self._positions[username] = len(self._names)
+            self._names.append(username)
+        self._insert(key)
+        self._keys[username] = key
+
+    def discard(self, username):
+        key = self._keys.pop(username, None)
+        if key is None:
+            return
+        self._remove(key)
+        # Swap-remove from the random pick list
+        idx = self._positions.pop(username)
+        last = self._names.pop()
+        if last != username:
+            self._names[idx] = last
+            self._positions[last] = idx
+
+    def rank_of(self, username):
+        """1-based leaderboard position, or None for unknown players"""
+        key = self._keys.get(username)
+        if key is None:
+            return None
+        node = self._head
+        pos = 0
+        for level in range(self.MAX_LEVELS - 1, -1, -1):
+            nxt = node.next[level]
+            while nxt is not None and nxt.key < key:
+                pos += node.width[level]
+                node = nxt
+                nxt = node.next[level]
+        return pos + 1
+
+    def top(self, n=None):
+        """Usernames from highest to lowest score (first n, or all)"""
+        names = []
+        node = self._head.next[0]
+        while node is not None and (n is None or len(names) < n):
+            names.append(node.key[1])
+            node = node.next[0]
+        return names
+
+    def random_other(self, username):
+        """Random player that is not username, or None"""
+        count = len(self._names)
+        idx = self._positions.get(username)
+        if idx is None:
+            return random.choice(self._names) if count else None
+        if count < 2:
+            return None
+        pick = random.randrange(count - 1)
+        if pick >= idx:
+            pick += 1
+        return self._names[pick]
 
 class PlayerDatabase:
-    def __init__(self, filepath):
+    JOURNAL_HEADER = "# Journal Generation:"
+    JOURNAL_MAX_RECORDS = 5000  # Compact early so startup replay stays short
+
+    def __init__(self, filepath, commit_window=0.25, compact_interval=300):
         self.filepath = filepath
+        self.journal_path = filepath + ".journal"
         self.players = {}
+        self.ranking = RankingIndex()
         self._last_mtime = 0
+
+        # Write-behind state: changed players are appended to the journal in
+        # batches, the full file is only rewritten on compaction.
+        self.commit_window = commit_window
+        self.compact_interval = compact_interval
+        self._generation = 0
+        self._dirty = set()
+        self._commit_task = None
+        self._write_lock = None
+        self._lock_loop = None
+        self._journal_records = 0
+        self._last_compact = time.time()
+        # Row hashes as last written to / read from the file, to spot Notepad edits
+        self._file_rows = {}
         self.load()
 
-    def load(self):
-        if not os.path.exists(self.filepath):
+    def configure(self, commit_window=None, compact_interval=None):
+        """Update group commit timings (seconds)"""
+        if commit_window is not None:
+            self.commit_window = max(0.0, float(commit_window))
+        if compact_interval is not None:
+            self.compact_interval = max(1.0, float(compact_interval))
+
+    @staticmethod
+    def _parse_line(line):
+        """Parse one 'username | score | ...' line. Returns (username, data) or None."""
+        parts = line.split('|')
+        if len(parts) < 3:
+            return None
+        username = parts[0].strip()
+        try:
+            return username, {
+                'loot_score': int(parts[1].strip()),
+                'last_loot_time': float(parts[2].strip()),
+                'luck': float(parts[3].strip()) if len(parts) >= 4 else 0.0,
+                'last_use_time': float(parts[4].strip()) if len(parts) >= 5 else 0.0,
+                'prestige_stars': int(parts[5].strip()) if len(parts) >= 6 else 0,
+                'shinies': int(parts[6].strip()) if len(parts) >= 7 else 0
+            }
+        except ValueError:
+            return None
+
+    @staticmethod
+    def _format_line(username, loot_score, last_loot_time, luck, last_use_time, prestige_stars, shinies):
+        return (f"{username} | {loot_score} | {last_loot_time} | {luck} | "
+                f"{last_use_time} | {prestige_stars} | {shinies}\n")
+
+    @staticmethod
+    def _record(username, data):
+        return (username, data['loot_score'], data['last_loot_time'], data.get('luck', 0.0),
+                data.get('last_use_time', 0.0), data.get('prestige_stars', 0), data.get('shinies', 0))
+
+    def load(self, external=False):
+        """Read the snapshot and replay the journal.
+
+        external=True (file edited while running): rows the user changed win,
+        every other player keeps the live data from memory.
+        """
+        if not os.path.exists(self.filepath) and not os.path.exists(self.journal_path):
             return
-        
+
+        start = time.perf_counter()
+        loaded_players = {}
+        generation = 0
+        if os.path.exists(self.filepath):
+            try:
+                current_mtime = os.path.getmtime(self.filepath)
+                self._last_mtime = current_mtime
+
+                with open(self.filepath, 'r', encoding='utf-8') as f:
+                    for line in f:
+                        line = line.strip()
+                        if line.startswith(self.JOURNAL_HEADER):
+                            try:
+                                generation = int(line[len(self.JOURNAL_HEADER):].strip())
+                            except ValueError:
+                                pass
+                            continue
+                        if not line or line.startswith('#'):
+                            continue
+                        parsed = self._parse_line(line)
+                        if parsed:
+                            loaded_players[parsed[0]] = parsed[1]
+
+            except Exception as e:
+                print(f"⚠️ Warning: Could not load database: {e}")
+                try:
+                    shutil.copy2(self.filepath, self.filepath + ".corrupt_backup")
+                    print(f"⚠️ Created backup of corrupted database: {self.filepath}.corrupt_backup")
+                except:
+                    pass
+                return
+
+        file_rows = {u: self._row_hash(u, data) for u, data in loaded_players.items()}
+        self._generation = generation
+        edited = external or self._edited_after_journal()
+        if external:
+            self._merge_external_edit(loaded_players, file_rows)
+            replayed = 0
+        elif edited:
+            # Edited while the bot was stopped: the journal predates the edit
+            # and would silently revert the edited rows
+            print("⚠️ Database was edited after the last journal write; journal ignored.")
+            self._journal_records = 0
+            replayed = 0
+        else:
+            replayed = self._replay_journal(loaded_players)
+
+        # Update existing dictionary to preserve references
+        self.players.clear()
+        self.players.update(loaded_players)
+        self.ranking.rebuild(self.players)
+        self._file_rows = file_rows
+        metrics.observe("chatcollect_db_load_seconds", time.perf_counter() - start)
+        if replayed:
+            print(f"✅ Database loaded. {len(self.players)} players ({replayed} journal records replayed).")
+        else:
+            print(f"✅ Database loaded. {len(self.players)} players.")
+
+        if edited:
+            # Fold the edit into a new generation right away so the old
+            # journal can never be replayed over it
+            try:
+                loop = asyncio.get_running_loop()
+            except RuntimeError:
+                loop = None
+            if loop is None:
+                # Start-up: nothing else is writing yet
+                self._apply_save(self.save_blocking())
+            else:
+                loop.create_task(self.compact())
+
+    def _row_hash(self, username, data):
+        return hash(self._record(username, data))
+
+    def _edited_after_journal(self):
+        """The file is newer than the journal only if something else wrote it"""
         try:
-            current_mtime = os.path.getmtime(self.filepath)
-            self._last_mtime = current_mtime
-            
-            with open(self.filepath, 'r', encoding='utf-8') as f:
-                loaded_players = {}
+            return os.path.getmtime(self.filepath) > os.path.getmtime(self.journal_path)
+        except OSError:
+            return False
+
+    def _merge_external_edit(self, edited, edited_rows):
+        """Keep live data for every player whose row the user left alone.
+
+        Changed rows come from the file; rows the user deleted stay deleted.
+        Players added since the last save are in neither file and are kept.
+        """
+        for username, data in self.players.items():
+            if edited_rows.get(username) == self._file_rows.get(username):
+                edited[username] = data
+
+    def _replay_journal(self, players):
+        """Apply journal records written since the last snapshot"""
+        self._journal_records = 0
+        if not os.path.exists(self.journal_path):
+            return 0
+
+        try:
+            with open(self.journal_path, 'r', encoding='utf-8') as f:
+                header = f.readline().strip()
+                if not header.startswith(self.JOURNAL_HEADER):
+                    return 0
+                try:
+                    journal_generation = int(header[len(self.JOURNAL_HEADER):].strip())
+                except ValueError:
+                    return 0
+                # A journal from an older generation was already folded into the snapshot
+                if journal_generation != self._generation:
+                    return 0
+
                 for line in f:
-                    line = line.strip()
-                    if not line or line.startswith('#'):
-                        continue
-                    parts = line.split('|')
-                    if len(parts) >= 3:
-                        username = parts[0].strip()
-                        try:
-                            loaded_players[username] = {
-                                'loot_score': int(parts[1].strip()),
-                                'last_loot_time': float(parts[2].strip()),
-                                'luck': float(parts[3].strip()) if len(parts) >= 4 else 0.0,
-                                'last_use_time': float(parts[4].strip()) if len(parts) >= 5 else 0.0,
-                                'prestige_stars': int(parts[5].strip()) if len(parts) >= 6 else 0,
-                                'shinies': int(parts[6].strip()) if len(parts) >= 7 else 0
-                            }
-                        except ValueError:
-                            continue
-                
-                # Update existing dictionary to preserve references
-                self.players.clear()
-                self.players.update(loaded_players)
-                print(f"✅ Database loaded. {len(self.players)} players.")
-                
+                    # A torn last line (crash mid-append) simply fails to parse
+                    parsed = self._parse_line(line.strip())
+                    if parsed:
+                        players[parsed[0]] = parsed[1]
+                        self._journal_records += 1
         except Exception as e:
-            print(f"⚠️ Warning: Could not load database: {e}")
-            try:
-                shutil.copy2(self.filepath, self.filepath + ".corrupt_backup")
-                print(f"⚠️ Created backup of corrupted database: {self.filepath}.corrupt_backup")
-            except:
-                pass
+            print(f"⚠️ Warning: Could not replay journal: {e}")
+        return self._journal_records
 
     def reload_if_needed(self):
         """Reloads the database if the file has changed on disk"""
         if not os.path.exists(self.filepath):
             return
+        # Mid-write the new mtime is ours but not recorded yet; check again next command
+        if self._writing():
+            return
         
         try:
             current_mtime = os.path.getmtime(self.filepath)
             if current_mtime > self._last_mtime:
                 print("🔄 File changed externally, reloading database...")
-                self.load()
+                self.load(external=True)
         except Exception as e:
             print(f"⚠️ Error checking file update: {e}")
 
-    def save_blocking(self):
-        """Blocking save for use in executor"""
+    # ---- Player access (keeps the ranking index in sync) ----
+    def get_or_create(self, username):
+        """Return the player's data, creating a fresh entry if needed"""
+        data = self.players.get(username)
+        if data is None:
+            data = {
+                'loot_score': 0,
+                'last_loot_time': 0,
+                'luck': 0.0,
+                'last_use_time': 0.0,
+                'prestige_stars': 0,
+                'shinies': 0
+            }
+            self.players[username] = data
+            self.ranking.update(username, 0)
+        return data
+
+    def set_score(self, username, score):
+        self.players[username]['loot_score'] = score
+        self.ranking.update(username, score)
+
+    def add_score(self, username, delta):
+        self.set_score(username, self.players[username]['loot_score'] + delta)
+
+    def top(self, n):
+        """Top n players as (username, data), highest score first"""
+        self._check_ranking()
+        return [(username, self.players[username]) for username in self.ranking.top(n)]
+
+    def rank_of(self, username):
+        self._check_ranking()
+        return self.ranking.rank_of(username)
+
+    def random_other(self, username):
+        """Random player other than username (O(1)), or None"""
+        self._check_ranking()
+        return self.ranking.random_other(username)
+
+    def _check_ranking(self):
+        # Entries added to players directly would be missing from the index
+        if len(self.ranking) != len(self.players):
+            self.ranking.rebuild(self.players)
+
+    def snapshot(self):
+        """Copy all player rows, highest score first. Must run on the thread that mutates players."""
+        self._check_ranking()
+        return [self._record(username, self.players[username]) for username in self.ranking.top()]
+
+    def save_blocking(self, snapshot=None):
+        """Blocking full rewrite (compaction) for use in executor.
+
+        Touches no state the bot loop reads; returns (mtime, row hashes,
+        generation) for _apply_save() to install on the loop, or None.
+        """
+        if snapshot is None:
+            snapshot = self.snapshot()
+        generation = self._generation + 1
+        start = time.perf_counter()
         try:
             # Write to temp file first to prevent corruption
             temp_file = self.filepath + ".tmp"
             with open(temp_file, 'w', encoding='utf-8') as f:
                 f.write("# ChatCollect Player Database - Edit with Notepad\n")
                 f.write("# Format: username | loot_score | last_loot_time | luck | last_use_time | prestige_stars | shinies\n")
-                f.write("# WARNING: Keep the | separators intact!\n\n")
-                
-                sorted_players = sorted(self.players.items(), key=lambda x: x[1]['loot_score'], reverse=True)
-                for username, data in sorted_players:
-                    f.write(f"{username} | {data['loot_score']} | {data['last_loot_time']} | "
-                            f"{data.get('luck', 0.0)} | {data.get('last_use_time', 0.0)} | "
-                            f"{data.get('prestige_stars', 0)} | {data.get('shinies', 0)}\n")
+                f.write("# WARNING: Keep the | separators intact!\n")
+                f.write(f"{self.JOURNAL_HEADER} {generation}\n\n")
+
+                # Snapshot is already in ranking order
+                f.writelines(self._format_line(*record) for record in snapshot)
+                # The snapshot must be on disk before it replaces the old file
+                # and the journal is reset, or a power loss could leave neither
+                f.flush()
+                os.fsync(f.fileno())
+            written = os.path.getsize(temp_file)
             
             # Atomic replace
             if os.path.exists(self.filepath):
                 os.replace(temp_file, self.filepath)
             else:
                 os.rename(temp_file, self.filepath)
-            
-            # Update mtime so we don't reload our own save
-            self._last_mtime = os.path.getmtime(self.filepath)
+            self._fsync_folder()
+            mtime = os.path.getmtime(self.filepath)
+
+            # Start a fresh journal. If we crash before this, the old journal
+            # carries the previous generation and is ignored on the next load.
+            with open(self.journal_path, 'w', encoding='utf-8') as f:
+                f.write(f"{self.JOURNAL_HEADER} {generation}\n")
+                f.flush()
+                os.fsync(f.fileno())
+
+            metrics.observe("chatcollect_db_write_seconds", time.perf_counter() - start, kind="snapshot")
+            metrics.inc("chatcollect_db_bytes_written_total", written, kind="snapshot")
+            return mtime, {record[0]: hash(record) for record in snapshot}, generation
                 
         except Exception as e:
             print(f"❌ Error saving database: {e}")
+            return None
+
+    def _apply_save(self, result):
+        """Install what save_blocking() wrote; True if it succeeded"""
+        if not result:
+            return False
+        # Our own mtime, so reload_if_needed() doesn't take it for an edit
+        self._last_mtime, self._file_rows, self._generation = result
+        return True
+
+    def _fsync_folder(self):
+        """Persist the rename itself (POSIX only; Windows has no directory handles for this)"""
+        if os.name != "posix":
+            return
+        try:
+            fd = os.open(os.path.dirname(os.path.abspath(self.filepath)), os.O_RDONLY)
+            try:
+                os.fsync(fd)
+            finally:
+                os.close(fd)
+        except OSError:
+            pass
 
-    async def save(self):
-        """Async save wrapper"""
+    def append_journal_blocking(self, lines):
+        """Blocking journal append for use in executor"""
+        start = time.perf_counter()
+        try:
+            new_file = not os.path.exists(self.journal_path) or os.path.getsize(self.journal_path) == 0
+            payload = "".join(lines)
+            if new_file:
+                payload = f"{self.JOURNAL_HEADER} {self._generation}\n" + payload
+            payload = payload.encode('utf-8')
+            with open(self.journal_path, 'ab') as f:
+                f.write(payload)
+                f.flush()
+                os.fsync(f.fileno())
+            metrics.observe("chatcollect_db_write_seconds", time.perf_counter() - start, kind="journal")
+            metrics.inc("chatcollect_db_bytes_written_total", len(payload), kind="journal")
+            return True
+        except Exception as e:
+            print(f"❌ Error writing journal: {e}")
+            return False
+
+    def _writing(self):
+        """A journal append or compaction is in flight on the running loop"""
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            return False
+        return self._lock_loop is loop and self._write_lock.locked()
+
+    def _get_write_lock(self):
+        # The bot gets a fresh event loop on every start, so bind the lock per loop
         loop = asyncio.get_running_loop()
-        await loop.run_in_executor(None, self.save_blocking)
+        if self._write_lock is None or self._lock_loop is not loop:
+            self._write_lock = asyncio.Lock()
+            self._lock_loop = loop
+        return self._write_lock
 
-# Initialize Managers
-asset_manager = AssetManager(OVERLAY_FOLDER)
-db = PlayerDatabase(DB_PATH)
-player_data = db.players
+    async def save(self, *usernames):
+        """Queue changed players for the next group commit.
+
+        Returns immediately; the records are appended to the journal together
+        with every other change made within commit_window. Without usernames
+        nothing happens; a full rewrite only goes through compact().
+        """
+        self._dirty.update(u for u in usernames if u)
+        if self._dirty and self._commit_task is None:
+            self._commit_task = asyncio.get_running_loop().create_task(self._group_commit())
+
+    async def _group_commit(self):
+        await asyncio.sleep(self.commit_window)
+        # Changes arriving while we write schedule the next batch
+        self._commit_task = None
+        await self._commit_pending()
+
+    async def _commit_pending(self):
+        async with self._get_write_lock():
+            if self._dirty:
+                # Format on the event loop thread, write in the executor
+                dirty = [u for u in self._dirty if u in self.players]
+                self._dirty.clear()
+                lines = [self._format_line(*self._record(u, self.players[u])) for u in dirty]
+                loop = asyncio.get_running_loop()
+                if await loop.run_in_executor(None, self.append_journal_blocking, lines):
+                    self._journal_records += len(lines)
+                else:
+                    self._dirty.update(dirty)
+
+            if (self._journal_records >= self.JOURNAL_MAX_RECORDS or
+                    (self._journal_records and time.time() - self._last_compact >= self.compact_interval)):
+                await self._compact_locked()
+
+    async def compact(self):
+        """Rewrite the human-readable file from memory and reset the journal"""
+        async with self._get_write_lock():
+            await self._compact_locked()
+
+    async def _compact_locked(self):
+        # Snapshot on the event loop thread so the executor never walks
+        # player_data while chat handlers are changing it.
+        dirty = set(self._dirty)
+        self._dirty.clear()
+        snapshot = self.snapshot()
+        loop = asyncio.get_running_loop()
+        if self._apply_save(await loop.run_in_executor(None, self.save_blocking, snapshot)):
+            self._journal_records = 0
+            self._last_compact = time.time()
+        else:
+            self._dirty.update(dirty)
+
+    async def flush(self):
+        """Commit everything pending and compact (used on shutdown)"""
+        if self._commit_task is not None:
+            self._commit_task.cancel()
+            self._commit_task = None
+        await self._commit_pending()
+        if self._journal_records:
+            await self.compact()
+
+# Managers are created by init_managers() at start-up, never on import, so
+# tools that point them at a temp folder don't load the real data first
+asset_manager = None
+db = None
+player_data = None
+
+# Gauges read the current module-level managers (init_managers may replace them)
+metrics.set_gauge("chatcollect_db_players", lambda: len(db.players) if db else 0)
+metrics.set_gauge("chatcollect_assets", lambda: len(asset_manager.index.normal_items) if asset_manager else 0, pool="normal")
+metrics.set_gauge("chatcollect_assets", lambda: len(asset_manager.index.legendary_items) if asset_manager else 0, pool="legendary")
+
+def init_managers(db_path=DB_PATH, overlay_folder=OVERLAY_FOLDER):
+    """Create the module-level managers (other paths for benchmarks and tests).
+
+    db_path=None skips the shared database (headless mode opens one per channel).
+    """
+    global asset_manager, db, player_data
+    asset_manager = AssetManager(overlay_folder)
+    if db_path is None:
+        db = None
+        player_data = None
+    else:
+        db = PlayerDatabase(db_path)
+        player_data = db.players
 
 # ============ BAKED GOODS HELPERS ============
 def choose_loot_item(rarity="standard", legendary_chance_1_in_x=1000):
-    """Choose a baked good based on rarity"""
-    legendary = asset_manager.legendary_items
-    normal = asset_manager.normal_items
+    """Choose a baked good based on rarity (weighted by drop_weights.json)"""
+    index = asset_manager.index
     
     # Shiny: Pull from BOTH pools
     if rarity == "shiny":
-        pool = normal + legendary
-        if not pool: 
+        if not index.all_table: 
             return "croissant.png", False
         
-        choice = random.choice(pool)
-        is_legendary = choice in legendary
-        return choice, is_legendary
+        item = index.all_table.pick()
+        return item, item in index.legendary_set
 
     # Standard/Golden/Ruined: Configurable chance of Legendary, else Normal
     chance = 1.0 / max(1, legendary_chance_1_in_x)
     
-    if legendary and random.random() < chance:
-        return random.choice(legendary), True
+    if index.legendary_table and random.random() < chance:
+        return index.legendary_table.pick(), True
     else:
-        return random.choice(normal), False
+        return index.normal_table.pick(), False
 
 def format_item_name(filename):
-    """Convert filename to display name"""
-    # Handle paths like "legendary/cake.png" - get just the filename
-    name = os.path.basename(filename)
-    name = os.path.splitext(name)[0]
-    
-    # Case-insensitive removal of prefix
-    lower_name = name.lower()
-    if lower_name.startswith("legendary-") or lower_name.startswith("legendary_") or lower_name.startswith("legendary "):
-        name = name[10:]
-        
-    return name.replace("_", " ").replace("-", " ").strip().title()
+    """Convert filename to display name (cached per asset)"""
+    return asset_manager.display_name(filename)
 
-def get_leaderboard_message(show):
-    sorted_players = sorted(player_data.items(), key=lambda x: x[1]['loot_score'], reverse=True)[:10]
+def normalize_channel(name):
+    """Twitch channel names are lowercase, without the leading #"""
+    return (name or "").strip().lstrip("#").lower()
+
+def get_leaderboard_message(show, database=None):
+    if database is None:
+        database = db
+    sorted_players = database.top(10)
     leaderboard_data = []
     for rank, (username, data) in enumerate(sorted_players, 1):
         leaderboard_data.append({
@@ -805,46 +1781,530 @@ def get_leaderboard_message(show):
     }
 
 # ============ WEBSOCKET SERVER ============
-overlay_clients = set()
+class OverlayClient:
+    """One connected overlay with its own bounded outbound queue"""
+
+    def __init__(self, websocket, max_queue=64, max_lag=5.0):
+        self.websocket = websocket
+        self.max_queue = max_queue
+        self.max_lag = max_lag
+        self.queue = collections.deque()
+        self.wakeup = asyncio.Event()
+        self.board_version = 0       # Leaderboard version this overlay has rendered
+        self.board_pending = False   # Latest leaderboard not yet sent (collapses repeats)
+        self.supports_diff = False   # Older overlay.html files only understand full updates
+        self.dropped = 0
+        self.task = None
+
+    def push(self, data):
+        if len(self.queue) >= self.max_queue:
+            # Slow consumer: drop the oldest animation rather than block everyone
+            self.queue.popleft()
+            self.dropped += 1
+            metrics.inc("chatcollect_overlay_dropped_total", reason="queue_full")
+        self.queue.append((time.time(), data))
+        self.wakeup.set()
+
+    def push_leaderboard(self):
+        self.board_pending = True
+        self.wakeup.set()
+
+    async def run(self, broadcaster):
+        """Drain this client's queue; a stalled socket only stalls itself"""
+        try:
+            while True:
+                await self.wakeup.wait()
+                self.wakeup.clear()
+                while self.board_pending or self.queue:
+                    if self.board_pending:
+                        self.board_pending = False
+                        data = broadcaster.leaderboard_message_for(self.board_version if self.supports_diff else 0)
+                        self.board_version = broadcaster.board_version
+                        await self.websocket.send(data)
+                        continue
+
+                    queued_at, data = self.queue.popleft()
+                    if time.time() - queued_at > self.max_lag:
+                        # Animation is too late to be meaningful
+                        self.dropped += 1
+                        metrics.inc("chatcollect_overlay_dropped_total", reason="late")
+                        continue
+                    await self.websocket.send(data)
+        except asyncio.CancelledError:
+            raise
+        except Exception:
+            # Connection closed; handle_overlay_connection cleans up
+            pass
+
+class OverlayBroadcaster:
+    """Fan-out of overlay events: encode once, queue per client, debounce leaderboards"""
+
+    def __init__(self, queue_size=64, max_lag=5.0, leaderboard_interval=1.0, database=None):
+        self.clients = set()
+        self.database = database  # None = the module-level db
+        self.queue_size = queue_size
+        self.max_lag = max_lag
+        self.leaderboard_interval = leaderboard_interval
+
+        self.board_version = 0
+        self._board_rows = []
+        self._board_show = False
+        self._board_full = None
+        self._board_diff = None
+        self._board_requested_show = False
+        self._board_task = None
+        self._board_seq = 0
+        self._last_board_publish = 0
+
+    def configure(self, queue_size=None, max_lag=None, leaderboard_interval=None):
+        if queue_size is not None:
+            self.queue_size = max(1, int(queue_size))
+        if max_lag is not None:
+            self.max_lag = max(0.1, float(max_lag))
+        if leaderboard_interval is not None:
+            self.leaderboard_interval = max(0.0, float(leaderboard_interval))
+        for client in self.clients:
+            client.max_queue = self.queue_size
+            client.max_lag = self.max_lag
+
+    def register(self, websocket):
+        client = OverlayClient(websocket, self.queue_size, self.max_lag)
+        client.task = asyncio.get_running_loop().create_task(client.run(self))
+        self.clients.add(client)
+        # New overlays start from the full current leaderboard
+        if self.board_version:
+            client.push_leaderboard()
+        return client
+
+    def unregister(self, client):
+        self.clients.discard(client)
+        if client.task:
+            client.task.cancel()
+
+    def reset(self):
+        """Drop clients and the pending leaderboard push of a loop that is going away.
+
+        The broadcaster outlives the bot; without this a restarted bot inherits
+        dead clients and a debounce task that never finishes.
+        """
+        for client in list(self.clients):
+            self.unregister(client)
+        if self._board_task is not None:
+            self._board_task.cancel()
+            self._board_task = None
+
+    def resync(self, client):
+        """Overlay lost track of the leaderboard; send it a full copy"""
+        client.board_version = 0
+        if self.board_version:
+            client.push_leaderboard()
+
+    def broadcast(self, message):
+        if not self.clients:
+            return
+        with metrics.time("chatcollect_overlay_broadcast_seconds"):
+            data = json.dumps(message)
+            for client in self.clients:
+                client.push(data)
+        metrics.inc("chatcollect_overlay_messages_total")
+
+    def request_leaderboard(self, show):
+        """Debounced leaderboard push (at most once per leaderboard_interval)"""
+        self._board_requested_show = show
+        loop = asyncio.get_running_loop()
+        if self._board_task is not None:
+            if not self._board_task.done() and self._board_task.get_loop() is loop:
+                return
+            # Left over from a loop that was stopped mid-debounce
+            self._board_task = None
+        delay = self._last_board_publish + self.leaderboard_interval - time.time()
+        self._board_seq += 1
+        self._board_task = loop.create_task(self._publish_later(max(0.0, delay), self._board_seq))
+
+    async def _publish_later(self, delay, seq):
+        try:
+            if delay:
+                await asyncio.sleep(delay)
+        finally:
+            # A task from an old loop (cleaned up late) must not clear a newer one
+            if seq == self._board_seq:
+                self._board_task = None
+        self.publish_leaderboard(self._board_requested_show)
+
+    def publish_leaderboard(self, show):
+        """Publish the current top-10 now, as a diff against the last one sent"""
+        self._last_board_publish = time.time()
+        rows = get_leaderboard_message(show, self.database)["data"]
+        if self.board_version and rows == self._board_rows and show == self._board_show:
+            return
+
+        old_rows = self._board_rows
+        changed = [row for i, row in enumerate(rows) if i >= len(old_rows) or old_rows[i] != row]
+        self.board_version += 1
+        self._board_diff = json.dumps({
+            "event": "leaderboard_diff",
+            "show": show,
+            "base": self.board_version - 1,
+            "version": self.board_version,
+            "size": len(rows),
+            "changed": changed
+        })
+        self._board_full = json.dumps({
+            "event": "leaderboard_update",
+            "show": show,
+            "version": self.board_version,
+            "data": rows
+        })
+        self._board_rows = rows
+        self._board_show = show
+
+        for client in self.clients:
+            client.push_leaderboard()
+
+    def leaderboard_message_for(self, client_version):
+        if client_version and client_version == self.board_version - 1:
+            return self._board_diff
+        return self._board_full
+
+overlay_broadcaster = OverlayBroadcaster()
+metrics.set_gauge("chatcollect_overlay_clients", lambda: len(overlay_broadcaster.clients))
+overlay_clients = overlay_broadcaster.clients
+
+# Multi-channel mode: ws://host:8765/<channel> -> that channel's broadcaster
+overlay_routes = {}
+
+def _request_path(websocket):
+    # websockets >= 14 keeps the path on .request, older releases on .path
+    request = getattr(websocket, "request", None)
+    path = getattr(request, "path", None) or getattr(websocket, "path", None) or "/"
+    return path.split("?")[0]
 
 async def handle_overlay_connection(websocket):
     """Handle incoming overlay connections"""
-    overlay_clients.add(websocket)
+    channel = normalize_channel(_request_path(websocket).strip("/"))
+    if overlay_routes:
+        broadcaster = overlay_routes.get(channel)
+        if broadcaster is None:
+            await websocket.close(code=1008, reason=f"Unknown channel: {channel or '(none)'}")
+            return
+    else:
+        # Single-channel mode serves the same overlay on every path
+        broadcaster = overlay_broadcaster
+
+    client = broadcaster.register(websocket)
     try:
-        async for _ in websocket:
-            pass
+        async for message in websocket:
+            if message == "diff":
+                client.supports_diff = True
+            elif message == "resync":
+                broadcaster.resync(client)
+    except websockets.ConnectionClosed:
+        # OBS closing a browser source doesn't always say goodbye
+        pass
     finally:
-        overlay_clients.remove(websocket)
+        broadcaster.unregister(client)
 
 async def broadcast_to_overlays(message):
-    """Send message to all connected overlays"""
-    if overlay_clients:
-        data = json.dumps(message)
-        await asyncio.gather(*[client.send(data) for client in overlay_clients], return_exceptions=True)
-
-async def start_overlay_server(log_callback=None):
-    """Start WebSocket server"""
+    """Queue message for all connected overlays (encoded once, never blocks on slow clients)"""
+    overlay_broadcaster.broadcast(message)
+
+def handle_http_request(*args):
+    """Plain HTTP on the overlay port: GET /metrics (Prometheus text). Anything else continues as a websocket."""
+    # websockets >= 14 passes (connection, request); older releases pass (path, request_headers)
+    if len(args) == 2 and hasattr(args[1], "path"):
+        connection, request = args
+        if request.path.split("?")[0] == "/metrics":
+            response = connection.respond(HTTPStatus.OK, metrics.render())
+            del response.headers["Content-Type"]
+            response.headers["Content-Type"] = METRICS_CONTENT_TYPE
+            return response
+        return None
+    path = args[0]
+    if path.split("?")[0] == "/metrics":
+        return HTTPStatus.OK, [("Content-Type", METRICS_CONTENT_TYPE)], metrics.render().encode("utf-8")
+    return None
+
+async def start_overlay_server(log_callback=None, host="0.0.0.0", port=8765):
+    """Start WebSocket server (also serves http://localhost:8765/metrics)"""
     try:
-        async with websockets.serve(handle_overlay_connection, "0.0.0.0", 8765):
+        async with websockets.serve(handle_overlay_connection, host, port, process_request=handle_http_request):
             await asyncio.Future()
     except OSError as e:
-        if e.errno == 10048:
-            msg = "❌ ERROR: Port 8765 is in use. Overlay disabled. Close other instances."
+        if e.errno in (errno.EADDRINUSE, 10048):
+            msg = f"❌ ERROR: Port {port} is in use. Overlay disabled. Close other instances."
             print(msg)
             if log_callback:
                 log_callback(msg)
         else:
             raise e
 
+# ============ LOOT RULES ============
+RARITIES = ("shiny", "ruined", "golden", "standard")
+
+class LootRules:
+    """Immutable, precompiled view of the game config used by the bot.
+
+    Built once per config change and swapped in as a whole, so a handler
+    that grabs bot.rules at the top sees one consistent set of values.
+    """
+
+    def __init__(self, config):
+        def _int(value, default):
+            try:
+                return int(value)
+            except (TypeError, ValueError):
+                return default
+
+        def _float(value, default):
+            try:
+                return float(value)
+            except (TypeError, ValueError):
+                return default
+
+        # Timings
+        self.cooldown = _int(config.get("cooldown", COOLDOWN), COOLDOWN)
+        rush_divider = max(1, _int(config.get("rush_hour_cooldown_divider", 6), 6))
+        self.rush_cooldown = max(1, self.cooldown // rush_divider)
+        self.use_cooldown = _int(config.get("use_cooldown", 300), 300)
+
+        # Chances
+        self.luck_per_point = _float(config.get("luck_per_point", 5.0), 5.0)
+        self.steal_chance = _float(config.get("steal_chance", 0.01), 0.01)
+        self.legendary_chance_1_in_x = _int(config.get("legendary_chance", 1000), 1000)
+        self.legendary_prob = 1.0 / max(1, self.legendary_chance_1_in_x)
+        self.shiny_prob = 1.0 / max(1, _int(config.get("shiny_chance", 10000), 10000))
+        self.ruined_prob = _float(config.get("ruined_chance", 0.05), 0.05)
+        self.golden_prob = _float(config.get("golden_chance", 0.05), 0.05)
+        # Cumulative table for players without luck (the common case)
+        self._base_table = self.rarity_table(0.0)
+
+        # Points (the Setup tab stores these as strings)
+        pts = dict(DEFAULT_CONFIG["points"])
+        pts.update(config.get("points", {}))
+        default_pts = DEFAULT_CONFIG["points"]
+        self.points = {key: _int(pts.get(key), default_pts[key]) for key in default_pts}
+        self.standard_min = self.points["standard_min"]
+        self.standard_max = max(self.standard_min, self.points["standard_max"])
+
+        self.contest_entry_cost = _int(config.get("contest_entry_cost", 10), 10)
+        self.loot_drive_target = _int(config.get("loot_drive_target", 150), 150)
+        self.show_leaderboard = bool(config.get("show_leaderboard", False))
+
+        # Ranks, ascending, for bisect
+        ranks = []
+        for r in config.get("ranks", DEFAULT_CONFIG["ranks"]):
+            try:
+                ranks.append((int(r["score"]), str(r["title"])))
+            except (KeyError, TypeError, ValueError):
+                continue
+        ranks.sort(key=lambda r: r[0])
+        self.rank_scores = tuple(r[0] for r in ranks)
+        self.rank_titles = tuple(r[1] for r in ranks)
+
+        # Names and message templates (pre-bound str.format)
+        self.commands = dict(DEFAULT_CONFIG["commands"])
+        self.commands.update(config.get("commands", {}))
+        self.events = dict(DEFAULT_CONFIG["events"])
+        self.events.update(config.get("events", {}))
+        templates = dict(DEFAULT_CONFIG["messages"])
+        templates.update(config.get("messages", {}))
+        self.messages = {key: str(template).format for key, template in templates.items()}
+
+    def rarity_table(self, luck):
+        """Cumulative shiny/ruined/golden thresholds; anything above is standard"""
+        shiny = self.shiny_prob + (luck / 1000.0)
+        ruined = shiny + self.ruined_prob
+        golden = ruined + (self.golden_prob + (luck / 200.0))
+        return (shiny, ruined, golden)
+
+    def roll_rarity(self, luck, rand_val):
+        table = self._base_table if not luck else self.rarity_table(luck)
+        return RARITIES[bisect.bisect_right(table, rand_val)]
+
+    def rank_title(self, score):
+        if not self.rank_titles:
+            return "Novice"
+        # Below the lowest threshold falls back to the lowest rank
+        return self.rank_titles[max(0, bisect.bisect_right(self.rank_scores, score) - 1)]
+
+    def format(self, key, **kwargs):
+        return self.messages[key](**kwargs)
+
+# ============ CHAT SCHEDULER ============
+_ChatItem = collections.namedtuple("_ChatItem", "target channel text group summary queued_at")
+
+class ChatScheduler:
+    """Outbound chat queue between the bot and Twitch.
+
+    Handlers enqueue and return immediately; one sender task drains the queue
+    through a token bucket so we stay under Twitch's per-channel send limit.
+    Announcements go out before loot replies, loot replies before cooldown
+    notices. Loot results that pile up while throttled are merged into one
+    line, and stale low-priority messages are dropped instead of sent late.
+    """
+    EVENT, REPLY, NOTICE = 0, 1, 2
+    # Seconds a message may wait before it's not worth sending any more
+    EXPIRY = {EVENT: None, REPLY: 30.0, NOTICE: 10.0}
+    MAX_PENDING = 200
+    MAX_LENGTH = 500  # Twitch message limit
+    WINDOW = 30.0
+    USER_LIMIT = 20
+    MOD_LIMIT = 100
+
+    def __init__(self, log_callback=None, group_prefixes=None):
+        self.log_callback = log_callback
+        self.group_prefixes = group_prefixes or {}
+        self.queues = [collections.deque() for _ in (self.EVENT, self.REPLY, self.NOTICE)]
+        self.sent = 0
+        self.coalesced = 0
+        self.expired = 0
+        self.dropped = 0
+        self.failed = 0
+        self._wakeup = None
+        self._task = None
+        self.limit = None
+        self.tokens = 0.0
+        self.configure()
+
+    def configure(self, moderator=False):
+        """Set the send limit. Call on the bot's loop; the sender reads the bucket there."""
+        limit = self.MOD_LIMIT if moderator else self.USER_LIMIT
+        if limit == self.limit:
+            # Settings saves that don't touch the limit keep the bucket as it is
+            return
+        now = time.monotonic()
+        if self.limit is not None:
+            # Bank the refill earned at the old rate before switching
+            self.tokens = self.tokens + (now - self._updated) * self.refill
+        self.limit = limit
+        # Burst plus one window of refill never exceeds the limit
+        self.burst = max(1, limit // 4)
+        self.refill = (limit - self.burst) / self.WINDOW
+        self.tokens = min(self.tokens, self.burst) if self._task else float(self.burst)
+        self._updated = now
+
+    def pending(self):
+        return sum(len(q) for q in self.queues)
+
+    def send(self, target, text, priority=REPLY, group=None, summary=None):
+        """Queue text for target (a twitchio Context or Channel)"""
+        if target is None or not text:
+            return
+        # Messages for the same channel may be merged, whatever object they arrived on
+        channel = getattr(getattr(target, "channel", target), "name", None) or id(target)
+        queue = self.queues[priority]
+        if len(queue) >= self.MAX_PENDING:
+            queue.popleft()
+            self.dropped += 1
+            metrics.inc("chatcollect_chat_messages_total", result="dropped")
+        queue.append(_ChatItem(target, channel, text, group, summary, time.monotonic()))
+        if self._wakeup is not None:
+            self._wakeup.set()
+
+    def start(self):
+        """Start the sender task on the running loop (idempotent)"""
+        if self._task is None or self._task.done():
+            self._task = asyncio.ensure_future(self.run())
+        return self._task
+
+    async def _acquire(self):
+        while True:
+            now = time.monotonic()
+            self.tokens = min(self.burst, self.tokens + (now - self._updated) * self.refill)
+            self._updated = now
+            if self.tokens >= 1:
+                self.tokens -= 1
+                return
+            await asyncio.sleep((1 - self.tokens) / self.refill)
+
+    def _next_message(self):
+        """Highest-priority live message, with same-group followers merged in"""
+        now = time.monotonic()
+        for priority, queue in enumerate(self.queues):
+            max_age = self.EXPIRY[priority]
+            # FIFO per priority, so only the head can be the oldest
+            while queue and max_age is not None and now - queue[0].queued_at > max_age:
+                queue.popleft()
+                self.expired += 1
+                metrics.inc("chatcollect_chat_messages_total", result="expired")
+            if not queue:
+                continue
+
+            head = queue.popleft()
+            if head.group is None or head.summary is None or not queue:
+                return head.target, head.text
+
+            prefix = self.group_prefixes.get(head.group, "")
+            parts = [head.summary]
+            length = len(prefix) + len(head.summary)
+            rest = collections.deque()
+            for item in queue:
+                if (item.group == head.group and item.channel == head.channel and item.summary is not None
+                        and length + 2 + len(item.summary) <= self.MAX_LENGTH):
+                    parts.append(item.summary)
+                    length += 2 + len(item.summary)
+                else:
+                    rest.append(item)
+            if len(parts) == 1:
+                return head.target, head.text
+            self.queues[priority] = rest
+            self.coalesced += len(parts) - 1
+            metrics.inc("chatcollect_chat_messages_total", len(parts) - 1, result="coalesced")
+            return head.target, prefix + ", ".join(parts)
+        return None
+
+    async def run(self):
+        self._wakeup = asyncio.Event()
+        while True:
+            if not any(self.queues):
+                self._wakeup.clear()
+                await self._wakeup.wait()
+            await self._acquire()
+            message = self._next_message()
+            if message is None:
+                # Everything pending had expired; keep the token
+                self.tokens += 1
+                continue
+            target, text = message
+            try:
+                with metrics.time("chatcollect_chat_send_seconds"):
+                    await target.send(text)
+                self.sent += 1
+                metrics.inc("chatcollect_chat_messages_total", result="sent")
+            except Exception as e:
+                # e.g. twitchio's own limiter disagreeing with ours - back off a full token
+                self.failed += 1
+                metrics.inc("chatcollect_chat_messages_total", result="failed")
+                self.tokens = 0.0
+                if self.log_callback:
+                    self.log_callback(f"⚠️ Chat send failed: {e}")
+
 # ============ TWITCH BOT ============
-class ChatCollectBot(commands.Bot):
-    def __init__(self, token, channel, log_callback, status_callback, config):
-        super().__init__(token=token, prefix="!", initial_channels=[channel], case_insensitive=True)
-        self.token = token
+class ChannelGame:
+    """Game state, database, overlay and command handlers for one channel.
+
+    Several games can share one ChatCollectBot (one Twitch connection),
+    one event loop and the asset cache.
+    """
+
+    def __init__(self, channel, config, database, overlay, log_callback, status_callback=None):
+        self.channel_name = normalize_channel(channel)
+        self.client = None  # ChatCollectBot, set when attached
         self.log_callback = log_callback
         self.status_callback = status_callback
-        self.channel_name = channel
         self.config = config
+        self.rules = LootRules(config)
+        self.db = database
+        self.player_data = database.players
+        self.overlay = overlay
+        self._handlers = {}
+        self._tasks = []
+
+        # Outbound chat (rate limited, prioritised, coalesced)
+        self.chat = ChatScheduler(log_callback, {"contest": "⚔️ Joined the Contest: "})
+        self.chat.configure(moderator=bool(config.get('chat_is_moderator', False)))
+        metrics.set_gauge("chatcollect_chat_queue", self.chat.pending, channel=self.channel_name)
+        self._build_handlers()
         
         # Event States
         self.rush_hour_active = False
@@ -875,45 +2335,54 @@ class ChatCollectBot(commands.Bot):
     def set_show_banner(self, enabled):
         self.show_banner = enabled
 
-    def get_rank_title(self, score):
-        ranks = self.config.get("ranks", DEFAULT_CONFIG["ranks"])
-        # Ensure ranks are sorted by score descending for the check
-        # The config might have them in any order, but usually ascending.
-        # Let's sort them descending to find the highest threshold met.
-        sorted_ranks = sorted(ranks, key=lambda x: x["score"], reverse=True)
-        
-        for r in sorted_ranks:
-            if score >= r["score"]:
-                return r["title"]
-        # Fallback to lowest
-        if sorted_ranks:
-            return sorted_ranks[-1]["title"]
-        return "Novice"
-
-    async def event_ready(self):
-        self.log_callback(f"✅ Bot logged in as {self.nick}")
-        self.log_callback(f"📺 Connected to channel: {self.channel_name}")
-        
-        # Register Dynamic Commands
-        cmds = self.config.get("commands", DEFAULT_CONFIG["commands"])
-        
-        # Helper to strip prefix for registration
-        def get_cmd_name(cmd_str):
-            return cmd_str.lstrip('!')
-
-        self.add_command(commands.Command(name=get_cmd_name(cmds["loot"]), func=self.cmd_loot))
-        self.add_command(commands.Command(name=get_cmd_name(cmds["leaderboard"]), func=self.cmd_leaderboard))
-        self.add_command(commands.Command(name=get_cmd_name(cmds["contest"]), func=self.cmd_contest))
-        self.add_command(commands.Command(name=get_cmd_name(cmds["use"]), func=self.cmd_use))
-
-        self.log_callback(f"🎮 Commands: {cmds['loot']}, {cmds['leaderboard']}, {cmds['contest']}")
-        self.log_callback("-" * 50)
-        self.loop.create_task(self.game_loop())
+    def update_config(self, config):
+        """Swap in a new config; handlers pick up the new rules on their next call"""
+        rules = LootRules(config)
+        self.config = config
+        self.rules = rules
+        self.chat.configure(moderator=bool(config.get('chat_is_moderator', False)))
+        self._build_handlers()
+
+    def _build_handlers(self):
+        # Command words without the "!" prefix, matched case-insensitively
+        cmds = self.rules.commands
+        self._handlers = {
+            cmds["loot"].lstrip('!').lower(): self.cmd_loot,
+            cmds["leaderboard"].lstrip('!').lower(): self.cmd_leaderboard,
+            cmds["contest"].lstrip('!').lower(): self.cmd_contest,
+            cmds["use"].lstrip('!').lower(): self.cmd_use
+        }
 
-    async def event_command_error(self, ctx, error):
-        if isinstance(error, commands.CommandNotFound):
+    def get_rank_title(self, score):
+        return self.rules.rank_title(score)
+
+    def get_channel(self):
+        """twitchio Channel for announcements (None until connected)"""
+        if self.client is None:
+            return None
+        return self.client.get_channel(self.channel_name)
+
+    def start(self):
+        """Start the chat sender and event timers on the running loop (idempotent)"""
+        self.chat.start()
+        if not any(not task.done() for task in self._tasks):
+            self._tasks = [asyncio.ensure_future(self.game_loop())]
+        cmds = self.rules.commands
+        self.log_callback(f"🎮 [{self.channel_name}] Commands: {cmds['loot']}, {cmds['leaderboard']}, {cmds['contest']}")
+
+    async def handle_message(self, message):
+        """Run the command handler for a chat message, if it is one of ours"""
+        content = message.content or ""
+        if not content.startswith("!"):
+            return
+        handler = self._handlers.get(content.split(maxsplit=1)[0][1:].lower())
+        if handler is None:
             return
-        self.log_callback(f"❌ Command Error: {error}")
+        ctx = await self.client.get_context(message)
+        try:
+            await handler(ctx)
+        except Exception as e:
+            self.log_callback(f"❌ Command Error: {e}")
 
     def _send_status_update(self):
         """Helper to send current event status to GUI"""
@@ -942,17 +2411,17 @@ class ChatCollectBot(commands.Bot):
         while True:
             try:
                 now = time.time()
-                channel = self.get_channel(self.channel_name)
+                channel = self.get_channel()
                 
-                msgs = self.config.get("messages", DEFAULT_CONFIG["messages"])
-                evts = self.config.get("events", DEFAULT_CONFIG["events"])
+                rules = self.rules
+                evts = rules.events
 
                 # Check Rush Hour Expiry
                 if self.rush_hour_active and now > self.rush_hour_end_time:
                     self.rush_hour_active = False
                     self.log_callback(f"🛑 {evts['rush_hour_name']} ended!")
                     if channel:
-                        await channel.send(f"🛑 The {evts['rush_hour_name']} has ended! Cooldowns are back to normal.")
+                        self.chat.send(channel, f"🛑 The {evts['rush_hour_name']} has ended! Cooldowns are back to normal.", ChatScheduler.EVENT)
                     self._send_status_update()
 
                 # Check Loot Drive Expiry (Failure)
@@ -960,7 +2429,7 @@ class ChatCollectBot(commands.Bot):
                     self.loot_drive_active = False
                     self.log_callback(f"😞 {evts['loot_drive_name']} Failed (Time out)")
                     if channel:
-                        await channel.send(f"😞 The {evts['loot_drive_name']} ended! We only collected {self.loot_drive_current}/{self.loot_drive_target}. No stars awarded.")
+                        self.chat.send(channel, f"😞 The {evts['loot_drive_name']} ended! We only collected {self.loot_drive_current}/{self.loot_drive_target}. No stars awarded.", ChatScheduler.EVENT)
                     self._send_status_update()
 
                 # Check Bounty Hunter Expiry
@@ -969,7 +2438,7 @@ class ChatCollectBot(commands.Bot):
                     self.bounty_hunter_craving = None
                     self.log_callback(f"😒 {evts['bounty_hunter_name']} left (Time out)")
                     if channel:
-                        await channel.send(f"😒 The {evts['bounty_hunter_name']} got tired of waiting and left!")
+                        self.chat.send(channel, f"😒 The {evts['bounty_hunter_name']} got tired of waiting and left!", ChatScheduler.EVENT)
                     self._send_status_update()
 
                 # Contest Logic
@@ -982,37 +2451,36 @@ class ChatCollectBot(commands.Bot):
                             remaining = int(self.contest_join_end_time - now)
                             time_str = f"{remaining // 60}m {remaining % 60}s" if remaining >= 60 else f"{remaining}s"
                             if channel:
-                                await channel.send(f"⚠️ {evts['contest_name']} entries closing in {time_str}! Join now!")
+                                self.chat.send(channel, f"⚠️ {evts['contest_name']} entries closing in {time_str}! Join now!", ChatScheduler.EVENT)
 
                     if now > self.contest_join_end_time:
                         if not self.contest_participants:
                             self.contest_state = "inactive"
                             self.log_callback(f"😞 {evts['contest_name']} cancelled (No participants)")
-                            if channel: await channel.send(f"😞 {evts['contest_name']} cancelled! No one joined.")
+                            if channel: self.chat.send(channel, f"😞 {evts['contest_name']} cancelled! No one joined.", ChatScheduler.EVENT)
                         else:
                             self.contest_state = "resolving"
                             self.contest_resolve_time = now + 30
                             names = ", ".join(self.contest_participants)
                             self.log_callback(f"🥊 {evts['contest_name']} Entries Closed! ({len(self.contest_participants)} entries)")
-                            if channel: await channel.send(f"🥊 {evts['contest_name']} Entries Closed! Participants: {names}. Winner chosen in 30s! Pool: {self.contest_pool} pts")
+                            if channel: self.chat.send(channel, f"🥊 {evts['contest_name']} Entries Closed! Participants: {names}. Winner chosen in 30s! Pool: {self.contest_pool} pts", ChatScheduler.EVENT)
                         self._send_status_update()
                 
                 elif self.contest_state == "resolving":
                     if now > self.contest_resolve_time:
                         # Reload DB before awarding prize
-                        db.reload_if_needed()
+                        self.db.reload_if_needed()
                         
                         winner = random.choice(self.contest_participants)
-                        if winner in player_data:
-                            player_data[winner]['loot_score'] += self.contest_pool
-                            await db.save()
+                        if winner in self.player_data:
+                            self.db.add_score(winner, self.contest_pool)
+                            await self.db.save(winner)
                         
                         self.log_callback(f"🏆 {evts['contest_name']} Winner: {winner} (+{self.contest_pool} pts)")
                         
-                        win_msg = msgs.get("contest_winner", DEFAULT_CONFIG["messages"]["contest_winner"])
-                        win_msg = win_msg.format(username=winner, prize=self.contest_pool)
+                        win_msg = rules.format("contest_winner", username=winner, prize=self.contest_pool)
                         
-                        if channel: await channel.send(win_msg)
+                        if channel: self.chat.send(channel, win_msg, ChatScheduler.EVENT)
                         self.contest_state = "inactive"
                         self._send_status_update()
 
@@ -1021,17 +2489,22 @@ class ChatCollectBot(commands.Bot):
 
                 # Dynamic sleep: 1s if active, 5s if inactive to save resources
                 if self.rush_hour_active or self.loot_drive_active or self.bounty_hunter_active:
-                    await asyncio.sleep(1)
+                    delay = 1
                 else:
-                    await asyncio.sleep(5)
+                    delay = 5
+                slept_at = time.perf_counter()
+                await asyncio.sleep(delay)
+                # Oversleep = time the event loop was busy elsewhere
+                metrics.observe("chatcollect_game_loop_lag_seconds", max(0.0, time.perf_counter() - slept_at - delay))
 
             except Exception as e:
                 print(f"Game Loop Error: {e}")
                 await asyncio.sleep(5)
 
+    @timed_command("use")
     async def cmd_use(self, ctx):
         # Reload DB if changed externally
-        db.reload_if_needed()
+        self.db.reload_if_needed()
         
         username = ctx.author.name.lower()
         parts = ctx.message.content.split()
@@ -1045,132 +2518,97 @@ class ChatCollectBot(commands.Bot):
         if amount < 1:
             return
 
-        if username not in player_data:
-            msgs = self.config.get("messages", DEFAULT_CONFIG["messages"])
-            msg = msgs.get("use_no_loot", DEFAULT_CONFIG["messages"]["use_no_loot"])
-            await ctx.send(msg.format(username=username))
+        rules = self.rules
+        if username not in self.player_data:
+            self.chat.send(ctx, rules.format("use_no_loot", username=username), ChatScheduler.NOTICE)
             return
 
         now = time.time()
-        last_eat = player_data[username].get('last_use_time', 0)
+        last_eat = self.player_data[username].get('last_use_time', 0)
         
-        # Get cooldown from config (default 5 minutes)
-        use_cooldown = int(self.config.get('use_cooldown', 300))
+        # Cooldown from config (default 5 minutes)
+        use_cooldown = rules.use_cooldown
         if now - last_eat < use_cooldown:
             remaining = int(use_cooldown - (now - last_eat))
-            await ctx.send(f"⏳ @{username}, you're too full! Wait {remaining}s.")
+            self.chat.send(ctx, f"⏳ @{username}, you're too full! Wait {remaining}s.", ChatScheduler.NOTICE)
             return
 
-        current_score = player_data[username]['loot_score']
+        current_score = self.player_data[username]['loot_score']
         if current_score < amount:
-            await ctx.send(f"@{username}, you don't have enough points! (Current: {current_score})")
+            self.chat.send(ctx, f"@{username}, you don't have enough points! (Current: {current_score})", ChatScheduler.NOTICE)
             return
 
         # Consume points
-        player_data[username]['loot_score'] -= amount
+        self.db.add_score(username, -amount)
         
         # Add luck (configurable % per point, default 5%)
-        luck_per_point = float(self.config.get('luck_per_point', 5.0))
-        current_luck = player_data[username].get('luck', 0.0)
+        luck_per_point = rules.luck_per_point
+        current_luck = self.player_data[username].get('luck', 0.0)
         added_luck = amount * luck_per_point
         new_luck = current_luck + added_luck
-        player_data[username]['luck'] = new_luck
-        player_data[username]['last_use_time'] = now
+        self.player_data[username]['luck'] = new_luck
+        self.player_data[username]['last_use_time'] = now
         
-        await db.save()
+        await self.db.save(username)
         
-        await ctx.send(f"🍽️ @{username} used {amount} points! Luck increased by {int(added_luck)}% (Total: {int(new_luck)}%). Good luck on your next loot!")
+        self.chat.send(ctx, f"🍽️ @{username} used {amount} points! Luck increased by {int(added_luck)}% (Total: {int(new_luck)}%). Good luck on your next loot!")
 
+    @timed_command("loot")
     async def cmd_loot(self, ctx):
         # Reload DB if changed externally
-        db.reload_if_needed()
+        self.db.reload_if_needed()
         
         username = ctx.author.name.lower()
         now = time.time()
         
-        msgs = self.config.get("messages", DEFAULT_CONFIG["messages"])
-        evts = self.config.get("events", DEFAULT_CONFIG["events"])
+        # One consistent rules snapshot for the whole command
+        rules = self.rules
+        evts = rules.events
 
-        if username not in player_data:
-            player_data[username] = {
-                'loot_score': 0, 
-                'last_loot_time': 0,
-                'luck': 0.0,
-                'last_use_time': 0.0,
-                'prestige_stars': 0,
-                'shinies': 0
-            }
+        self.db.get_or_create(username)
         
         # Ensure all fields exist
-        if 'luck' not in player_data[username]: player_data[username]['luck'] = 0.0
-        if 'shinies' not in player_data[username]: player_data[username]['shinies'] = 0
-        if 'prestige_stars' not in player_data[username]: player_data[username]['prestige_stars'] = 0
+        if 'luck' not in self.player_data[username]: self.player_data[username]['luck'] = 0.0
+        if 'shinies' not in self.player_data[username]: self.player_data[username]['shinies'] = 0
+        if 'prestige_stars' not in self.player_data[username]: self.player_data[username]['prestige_stars'] = 0
         
-        bake_score = player_data[username]['loot_score']
-        last_bake_time = player_data[username]['last_loot_time']
-        luck = player_data[username]['luck']
+        bake_score = self.player_data[username]['loot_score']
+        last_bake_time = self.player_data[username]['last_loot_time']
+        luck = self.player_data[username]['luck']
 
-        # COOLDOWN CHECK
-        cooldown_time = int(self.config.get("cooldown", COOLDOWN))
-        
-        # Check Rush Hour
-        if self.rush_hour_active:
-            rush_divider = int(self.config.get('rush_hour_cooldown_divider', 6))
-            cooldown_time = max(1, cooldown_time // rush_divider) # Reduced cooldown
+        # COOLDOWN CHECK (reduced during Rush Hour)
+        cooldown_time = rules.rush_cooldown if self.rush_hour_active else rules.cooldown
         
         if now - last_bake_time < cooldown_time:
             remaining = int(cooldown_time - (now - last_bake_time))
-            msg = msgs.get("cooldown", DEFAULT_CONFIG["messages"]["cooldown"])
-            await ctx.send(msg.format(username=username, remaining=remaining))
+            self.chat.send(ctx, rules.format("cooldown", username=username, remaining=remaining), ChatScheduler.NOTICE)
             return
 
-        old_rank_title = self.get_rank_title(bake_score)
+        old_rank_title = rules.rank_title(bake_score)
         
         # Rarity Logic
-        shiny_chance_1_in_x = int(self.config.get("shiny_chance", 10000))
-        legendary_chance_1_in_x = int(self.config.get("legendary_chance", 1000))
-        
-        base_shiny_prob = 1.0 / max(1, shiny_chance_1_in_x)
-        shiny_prob = base_shiny_prob + (luck / 1000.0)
-        
-        base_golden_chance = float(self.config.get('golden_chance', 0.05))
-        golden_prob = base_golden_chance + (luck / 200.0)
-        ruined_prob = float(self.config.get('ruined_chance', 0.05))
+        rarity = rules.roll_rarity(luck, random.random())
         
-        rand_val = random.random()
-        
-        rarity = "standard"
-        points_gained = 1
-        
-        # Loot Points Config
-        pts_cfg = self.config.get("points", DEFAULT_CONFIG["points"])
-        loot_min = int(pts_cfg.get("standard_min", 1))
-        loot_max = int(pts_cfg.get("standard_max", 1))
-        
-        if rand_val < shiny_prob:
-            rarity = "shiny"
-            points_gained = int(pts_cfg.get("shiny", 10))
-            player_data[username]['shinies'] += 1
-        elif rand_val < (shiny_prob + ruined_prob):
-            rarity = "ruined"
-            points_gained = int(pts_cfg.get("ruined", 0))
-        elif rand_val < (shiny_prob + ruined_prob + golden_prob):
-            rarity = "golden"
-            points_gained = int(pts_cfg.get("golden", 3))
+        if rarity == "shiny":
+            points_gained = rules.points["shiny"]
+            self.player_data[username]['shinies'] += 1
+        elif rarity == "ruined":
+            points_gained = rules.points["ruined"]
+        elif rarity == "golden":
+            points_gained = rules.points["golden"]
         else:
-            rarity = "standard"
-            points_gained = random.randint(loot_min, loot_max)
+            points_gained = random.randint(rules.standard_min, rules.standard_max)
             
         # Reset luck
-        player_data[username]['luck'] = 0.0
+        self.player_data[username]['luck'] = 0.0
         
         # Choose item
-        loot_item, is_legendary_item = choose_loot_item(rarity, legendary_chance_1_in_x)
+        loot_item, is_legendary_item = choose_loot_item(rarity, rules.legendary_chance_1_in_x)
         item_display_name = format_item_name(loot_item)
         
         # Legendary Bonus (Override points if legendary, unless already higher)
         if is_legendary_item:
-            leg_pts = int(pts_cfg.get("legendary", 5))
+            leg_pts = rules.points["legendary"]
             if points_gained < leg_pts:
                 points_gained = leg_pts
 
@@ -1178,40 +2616,39 @@ class ChatCollectBot(commands.Bot):
         critic_bonus = 0
         critic_msg = ""
         if self.bounty_hunter_active and self.bounty_hunter_craving == loot_item:
-            critic_bonus = int(pts_cfg.get("bounty_hunter", 50))
+            critic_bonus = rules.points["bounty_hunter"]
             points_gained += critic_bonus
             self.bounty_hunter_active = False
             self.bounty_hunter_craving = None
             
-            bh_msg = msgs.get("bounty_hunter_satisfied", DEFAULT_CONFIG["messages"]["bounty_hunter_satisfied"])
-            critic_msg = f" {bh_msg.format(username=username, points=critic_bonus)}"
+            critic_msg = f" {rules.format('bounty_hunter_satisfied', username=username, points=critic_bonus)}"
             
             self.log_callback(f"🧐 {username} satisfied the {evts['bounty_hunter_name']}!")
             self._send_status_update()
 
         # Steal Logic
-        steal_chance = float(self.config.get('steal_chance', 0.01))
         is_stolen = False
         thief = None
-        potential_thieves = [u for u in player_data if u != username]
         
-        if potential_thieves and random.random() < steal_chance:
+        if random.random() < rules.steal_chance:
+            thief = self.db.random_other(username)
+        
+        if thief:
             is_stolen = True
-            thief = random.choice(potential_thieves)
-            player_data[thief]['loot_score'] += points_gained
+            self.db.add_score(thief, points_gained)
             self.log_callback(f"😈 {thief} stole loot from {username}")
         else:
             bake_score += points_gained
 
-        new_rank_title = self.get_rank_title(bake_score)
+        new_rank_title = rules.rank_title(bake_score)
 
-        player_data[username]['loot_score'] = bake_score
-        player_data[username]['last_loot_time'] = now
-        await db.save()
+        self.db.set_score(username, bake_score)
+        self.player_data[username]['last_loot_time'] = now
+        await self.db.save(username, thief)
 
         # Update Leaderboard if enabled
-        if self.config.get('show_leaderboard', False):
-            await broadcast_to_overlays(get_leaderboard_message(True))
+        if rules.show_leaderboard:
+            self.overlay.request_leaderboard(True)
 
         ranked_up = old_rank_title != new_rank_title
         
@@ -1219,19 +2656,21 @@ class ChatCollectBot(commands.Bot):
         
         # Loot Drive Logic
         loot_drive_msg = ""
+        loot_drive_done = False
         if self.loot_drive_active:
             self.loot_drive_current += 1
             self.loot_drive_participants.add(username)
             remaining_sale = self.loot_drive_target - self.loot_drive_current
             if remaining_sale <= 0:
                 self.loot_drive_active = False
+                loot_drive_done = True
                 loot_drive_msg = f" 🍪 {evts['loot_drive_name']} COMPLETE! All participants get a Prestige Star! ⭐"
                 self.log_callback(f"🍪 {evts['loot_drive_name']} Completed!")
                 # Award stars
                 for participant in self.loot_drive_participants:
-                    if participant in player_data:
-                        player_data[participant]['prestige_stars'] = player_data[participant].get('prestige_stars', 0) + 1
-                await db.save()
+                    if participant in self.player_data:
+                        self.player_data[participant]['prestige_stars'] = self.player_data[participant].get('prestige_stars', 0) + 1
+                await self.db.save(*self.loot_drive_participants)
             else:
                  # Always show progress if active
                  loot_drive_msg = f" ({evts['loot_drive_name']}: {self.loot_drive_current}/{self.loot_drive_target})"
@@ -1240,38 +2679,44 @@ class ChatCollectBot(commands.Bot):
         # Construct Message
         msg = ""
         if is_stolen:
-            base_msg = msgs.get("loot_stolen", "😈 But @{thief} stole it from you! (+{points} pts)")
-            msg = base_msg.format(username=username, thief=thief, item=item_display_name, points=points_gained, rank=new_rank_title, score=int(bake_score))
+            msg = rules.format("loot_stolen", username=username, thief=thief, item=item_display_name, points=points_gained, rank=new_rank_title, score=int(bake_score))
             msg += f"{critic_msg}{loot_drive_msg}"
         elif rarity == "ruined":
-            base_msg = msgs.get("loot_ruined", DEFAULT_CONFIG["messages"]["loot_ruined"])
-            msg = base_msg.format(username=username, item=item_display_name, points=points_gained, rank=new_rank_title, score=int(bake_score))
+            msg = rules.format("loot_ruined", username=username, item=item_display_name, points=points_gained, rank=new_rank_title, score=int(bake_score))
             msg += f"{critic_msg}{loot_drive_msg}"
             self.log_callback(f"🔥 {username} ruined a {item_display_name}")
         elif rarity == "shiny":
-            base_msg = msgs.get("loot_shiny", DEFAULT_CONFIG["messages"]["loot_shiny"])
-            msg = base_msg.format(username=username, item=item_display_name, points=points_gained, rank=new_rank_title, score=int(bake_score))
+            msg = rules.format("loot_shiny", username=username, item=item_display_name, points=points_gained, rank=new_rank_title, score=int(bake_score))
             msg += f"{critic_msg}{loot_drive_msg}"
             self.log_callback(f"💎 {username} got a SHINY {item_display_name}")
         elif rarity == "golden":
-            base_msg = msgs.get("loot_golden", DEFAULT_CONFIG["messages"]["loot_golden"])
-            msg = base_msg.format(username=username, item=item_display_name, points=points_gained, rank=new_rank_title, score=int(bake_score))
+            msg = rules.format("loot_golden", username=username, item=item_display_name, points=points_gained, rank=new_rank_title, score=int(bake_score))
             msg += f"{critic_msg}{loot_drive_msg}"
             self.log_callback(f"🌟 {username} got a GOLDEN {item_display_name}")
         else:
             # Standard
             if is_legendary_item:
-                base_msg = msgs.get("loot_legendary", DEFAULT_CONFIG["messages"]["loot_legendary"])
-                msg = base_msg.format(username=username, item=item_display_name, points=points_gained, rank=new_rank_title, score=int(bake_score))
+                msg = rules.format("loot_legendary", username=username, item=item_display_name, points=points_gained, rank=new_rank_title, score=int(bake_score))
                 msg += f"{critic_msg}{loot_drive_msg}"
                 self.log_callback(f"✨ {username} looted a LEGENDARY {item_display_name}")
             else:
-                base_msg = msgs.get("loot_success", DEFAULT_CONFIG["messages"]["loot_success"])
-                msg = base_msg.format(username=username, item=item_display_name, points=points_gained, rank=new_rank_title, score=int(bake_score))
+                msg = rules.format("loot_success", username=username, item=item_display_name, points=points_gained, rank=new_rank_title, score=int(bake_score))
                 msg += f"{critic_msg}{loot_drive_msg}"
                 self.log_callback(f"🍞 {username} looted a {item_display_name}")
-                
-        await ctx.send(msg)
+
+        # Short form used when several loot results are waiting to be sent;
+        # Bounty Hunter and Loot Drive finales always go out in full
+        summary = None
+        if not critic_msg and not loot_drive_done:
+            if is_stolen:
+                summary = f"@{thief} stole {points_gained} from @{username}"
+            else:
+                summary = f"@{username} +{points_gained}"
+                if rarity != "standard":
+                    summary += f" {rarity}"
+                if is_legendary_item:
+                    summary += " legendary"
+        self.chat.send(ctx, msg, group="loot", summary=summary)
 
         message = {
             "event": "loot",
@@ -1285,16 +2730,17 @@ class ChatCollectBot(commands.Bot):
             "ranked_up": ranked_up,
             "show_banner": self.show_banner
         }
-        await broadcast_to_overlays(message)
+        self.overlay.broadcast(message)
 
+    @timed_command("leaderboard")
     async def cmd_leaderboard(self, ctx):
         # Reload DB if changed externally
-        db.reload_if_needed()
+        self.db.reload_if_needed()
         self.log_callback(f"📊 Leaderboard requested by {ctx.author.name}")
         await self.send_leaderboard_to_chat(ctx)
 
     async def fetch_leaderboard(self):
-        sorted_players = sorted(player_data.items(), key=lambda x: x[1]['loot_score'], reverse=True)[:5]
+        sorted_players = self.db.top(5)
         board = []
         for username, data in sorted_players:
             board.append({
@@ -1307,19 +2753,24 @@ class ChatCollectBot(commands.Bot):
     async def send_leaderboard_to_chat(self, ctx):
         board = await self.fetch_leaderboard()
         if not board:
-            await ctx.send("No collectors yet.")
+            self.chat.send(ctx, "No collectors yet.")
             return
         medals = ["🥇", "🥈", "🥉", "4️⃣", "5️⃣"]
         
         msg_parts = []
         for i, b in enumerate(board):
             username = b['username']
-            shinies = player_data[username].get('shinies', 0)
+            shinies = self.player_data[username].get('shinies', 0)
             badge = "💎" if shinies > 0 else ""
             msg_parts.append(f"{medals[i]} {username}{badge} ({b['title']}) - {b['score']}")
+
+        # Show the requester's own position if they're not on the board
+        requester = ctx.author.name.lower()
+        if requester in self.player_data and all(b['username'] != requester for b in board):
+            msg_parts.append(f"@{requester} #{self.db.rank_of(requester)} - {int(self.player_data[requester]['loot_score'])}")
             
         msg = " | ".join(msg_parts)
-        await ctx.send(msg)
+        self.chat.send(ctx, msg)
 
     async def start_rush_hour(self, duration_minutes=2):
         if self.rush_hour_active:
@@ -1330,26 +2781,25 @@ class ChatCollectBot(commands.Bot):
         duration_seconds = duration_minutes * 60
         self.rush_hour_end_time = time.time() + duration_seconds
         
-        evts = self.config.get("events", DEFAULT_CONFIG["events"])
-        msgs = self.config.get("messages", DEFAULT_CONFIG["messages"])
+        rules = self.rules
+        evts = rules.events
         
         self.log_callback(f"🚀 {evts['rush_hour_name']} started! ({duration_minutes} mins)")
         self._send_status_update()
-        channel = self.get_channel(self.channel_name)
+        channel = self.get_channel()
         if channel:
-            msg = msgs.get("rush_hour_start", DEFAULT_CONFIG["messages"]["rush_hour_start"])
-            await channel.send(msg)
+            self.chat.send(channel, rules.format("rush_hour_start"), ChatScheduler.EVENT)
 
     async def stop_rush_hour(self):
         if not self.rush_hour_active:
             return
         self.rush_hour_active = False
-        evts = self.config.get("events", DEFAULT_CONFIG["events"])
+        evts = self.rules.events
         self.log_callback(f"🛑 {evts['rush_hour_name']} stopped manually.")
         self._send_status_update()
-        channel = self.get_channel(self.channel_name)
+        channel = self.get_channel()
         if channel:
-            await channel.send(f"🛑 The {evts['rush_hour_name']} has been stopped manually.")
+            self.chat.send(channel, f"🛑 The {evts['rush_hour_name']} has been stopped manually.", ChatScheduler.EVENT)
 
     async def start_loot_drive(self, duration_minutes=20):
         if self.loot_drive_active:
@@ -1357,32 +2807,31 @@ class ChatCollectBot(commands.Bot):
             return
 
         self.loot_drive_active = True
-        self.loot_drive_target = int(self.config.get('loot_drive_target', 150))
+        rules = self.rules
+        self.loot_drive_target = rules.loot_drive_target
         self.loot_drive_current = 0
         duration_seconds = duration_minutes * 60
         self.loot_drive_end_time = time.time() + duration_seconds
         self.loot_drive_participants = set()
         
-        evts = self.config.get("events", DEFAULT_CONFIG["events"])
-        msgs = self.config.get("messages", DEFAULT_CONFIG["messages"])
+        evts = rules.events
         
         self.log_callback(f"🎒 {evts['loot_drive_name']} started! Target: {self.loot_drive_target} Items ({duration_minutes} mins)")
         self._send_status_update()
-        channel = self.get_channel(self.channel_name)
+        channel = self.get_channel()
         if channel:
-            msg = msgs.get("loot_drive_start", DEFAULT_CONFIG["messages"]["loot_drive_start"])
-            await channel.send(msg.format(target=self.loot_drive_target))
+            self.chat.send(channel, rules.format("loot_drive_start", target=self.loot_drive_target), ChatScheduler.EVENT)
 
     async def stop_loot_drive(self):
         if not self.loot_drive_active:
             return
         self.loot_drive_active = False
-        evts = self.config.get("events", DEFAULT_CONFIG["events"])
+        evts = self.rules.events
         self.log_callback(f"🛑 {evts['loot_drive_name']} stopped manually.")
         self._send_status_update()
-        channel = self.get_channel(self.channel_name)
+        channel = self.get_channel()
         if channel:
-            await channel.send(f"🛑 The {evts['loot_drive_name']} has been stopped manually.")
+            self.chat.send(channel, f"🛑 The {evts['loot_drive_name']} has been stopped manually.", ChatScheduler.EVENT)
 
     async def spawn_bounty_hunter(self, duration_minutes=10):
         if self.bounty_hunter_active:
@@ -1397,54 +2846,54 @@ class ChatCollectBot(commands.Bot):
         self.bounty_hunter_craving = random.choice(items)
         craving_name = format_item_name(self.bounty_hunter_craving)
         
-        evts = self.config.get("events", DEFAULT_CONFIG["events"])
-        msgs = self.config.get("messages", DEFAULT_CONFIG["messages"])
+        rules = self.rules
+        evts = rules.events
         
         self.log_callback(f"🧐 {evts['bounty_hunter_name']} arrived! Craving: {craving_name} ({duration_minutes} mins)")
         self._send_status_update()
-        channel = self.get_channel(self.channel_name)
+        channel = self.get_channel()
         if channel:
-            msg = msgs.get("bounty_hunter_spawn", DEFAULT_CONFIG["messages"]["bounty_hunter_spawn"])
-            await channel.send(msg.format(item=craving_name))
+            self.chat.send(channel, rules.format("bounty_hunter_spawn", item=craving_name), ChatScheduler.EVENT)
 
     async def stop_bounty_hunter(self):
         if not self.bounty_hunter_active:
             return
         self.bounty_hunter_active = False
         self.bounty_hunter_craving = None
-        evts = self.config.get("events", DEFAULT_CONFIG["events"])
+        evts = self.rules.events
         self.log_callback(f"🛑 {evts['bounty_hunter_name']} left manually.")
         self._send_status_update()
-        channel = self.get_channel(self.channel_name)
+        channel = self.get_channel()
         if channel:
-            await channel.send(f"🛑 The {evts['bounty_hunter_name']} has left the chat.")
+            self.chat.send(channel, f"🛑 The {evts['bounty_hunter_name']} has left the chat.", ChatScheduler.EVENT)
 
+    @timed_command("contest")
     async def cmd_contest(self, ctx):
         # Reload DB if changed externally
-        db.reload_if_needed()
+        self.db.reload_if_needed()
 
         if self.contest_state != "joining":
             return
         
         username = ctx.author.name.lower()
         if username in self.contest_participants:
-            await ctx.send(f"@{username}, you are already in the Contest!")
+            self.chat.send(ctx, f"@{username}, you are already in the Contest!", ChatScheduler.NOTICE)
             return
             
-        if username not in player_data:
-             await ctx.send(f"@{username}, you need to loot something first!")
+        if username not in self.player_data:
+             self.chat.send(ctx, f"@{username}, you need to loot something first!", ChatScheduler.NOTICE)
              return
 
-        entry_cost = int(self.config.get('contest_entry_cost', 10))
-        if player_data[username]['loot_score'] < entry_cost:
-            await ctx.send(f"@{username}, you need {entry_cost} points to join!")
+        entry_cost = self.rules.contest_entry_cost
+        if self.player_data[username]['loot_score'] < entry_cost:
+            self.chat.send(ctx, f"@{username}, you need {entry_cost} points to join!", ChatScheduler.NOTICE)
             return
             
-        player_data[username]['loot_score'] -= entry_cost
+        self.db.add_score(username, -entry_cost)
         self.contest_participants.append(username)
         self.contest_pool += entry_cost
-        await db.save()
-        await ctx.send(f"⚔️ @{username} joined the Contest! (Pool: {self.contest_pool})")
+        await self.db.save(username)
+        self.chat.send(ctx, f"⚔️ @{username} joined the Contest! (Pool: {self.contest_pool})", group="contest", summary=f"@{username}")
 
     async def start_contest(self, duration_minutes=2):
         if self.contest_state != "inactive":
@@ -1458,40 +2907,85 @@ class ChatCollectBot(commands.Bot):
         self.contest_participants = []
         self.contest_pool = 0
         
-        evts = self.config.get("events", DEFAULT_CONFIG["events"])
-        msgs = self.config.get("messages", DEFAULT_CONFIG["messages"])
-        cmds = self.config.get("commands", DEFAULT_CONFIG["commands"])
+        rules = self.rules
+        evts = rules.events
         
         self.log_callback(f"⚔️ {evts['contest_name']} started! ({duration_minutes} mins)")
         self._send_status_update()
-        channel = self.get_channel(self.channel_name)
+        channel = self.get_channel()
         if channel:
-            msg = msgs.get("contest_start", DEFAULT_CONFIG["messages"]["contest_start"])
-            await channel.send(msg.format(command=cmds['contest']))
+            self.chat.send(channel, rules.format("contest_start", command=rules.commands['contest']), ChatScheduler.EVENT)
 
     async def stop_contest(self):
         if self.contest_state == "inactive":
             return
         
-        evts = self.config.get("events", DEFAULT_CONFIG["events"])
+        evts = self.rules.events
         
         # Refund participants if manually stopped
         if self.contest_pool > 0:
             for p in self.contest_participants:
-                if p in player_data:
-                    player_data[p]['loot_score'] += 10
-            await db.save()
+                if p in self.player_data:
+                    self.db.add_score(p, 10)
+            await self.db.save(*self.contest_participants)
             self.log_callback(f"🛑 {evts['contest_name']} stopped manually. Points refunded.")
         else:
             self.log_callback(f"🛑 {evts['contest_name']} stopped manually.")
 
         self.contest_state = "inactive"
         self._send_status_update()
-        channel = self.get_channel(self.channel_name)
+        channel = self.get_channel()
         if channel:
-            await channel.send(f"🛑 The {evts['contest_name']} has been stopped manually. Points refunded.")
+            self.chat.send(channel, f"🛑 The {evts['contest_name']} has been stopped manually. Points refunded.", ChatScheduler.EVENT)
+
+class ChatCollectBot(commands.Bot):
+    """One Twitch chat connection for every channel; routes messages to each channel's ChannelGame"""
+
+    def __init__(self, token, games, log_callback):
+        self.games = {game.channel_name: game for game in games}
+        super().__init__(token=token, prefix="!", initial_channels=list(self.games), case_insensitive=True)
+        self.token = token
+        self.log_callback = log_callback
+        # The first game is the one the GUI controls
+        self.game = games[0]
+        for game in games:
+            game.client = self
+
+    async def event_ready(self):
+        self.log_callback(f"✅ Bot logged in as {self.nick}")
+        self.log_callback(f"📺 Connected to channel{'s' if len(self.games) > 1 else ''}: {', '.join(self.games)}")
+        for game in self.games.values():
+            game.start()
+        self.log_callback("-" * 50)
+
+    async def event_message(self, message):
+        if message.echo or message.channel is None:
+            return
+        game = self.games.get(message.channel.name.lower())
+        if game:
+            await game.handle_message(message)
+
+    async def flush(self):
+        """Commit every channel's pending database writes"""
+        for game in self.games.values():
+            await game.db.flush()
 
 # ============ BOT THREAD ============
+def configure_runtime(config, database=None, overlay=None):
+    """Apply persistence and overlay tuning from config (shared by the GUI and headless runs)"""
+    database = db if database is None else database
+    overlay = overlay_broadcaster if overlay is None else overlay
+    # Group commit / compaction timings
+    database.configure(
+        commit_window=int(config.get('save_commit_window_ms', 250)) / 1000.0,
+        compact_interval=int(config.get('autosave_interval', 5)) * 60
+    )
+    overlay.configure(
+        queue_size=int(config.get('overlay_queue_size', 64)),
+        max_lag=int(config.get('overlay_max_lag_ms', 5000)) / 1000.0,
+        leaderboard_interval=int(config.get('leaderboard_update_ms', 1000)) / 1000.0
+    )
+
 class BotThread(QThread):
     log_signal = pyqtSignal(str)
     error_signal = pyqtSignal(str)
@@ -1514,30 +3008,44 @@ class BotThread(QThread):
 
     def set_show_banner(self, enabled):
         if self.bot:
-            self.bot.set_show_banner(enabled)
+            self.bot.game.set_show_banner(enabled)
 
     def send_leaderboard_update(self, show_leaderboard):
         if not self.loop:
             return
+        self.loop.call_soon_threadsafe(overlay_broadcaster.publish_leaderboard, show_leaderboard)
 
-        async def _send():
-            message = get_leaderboard_message(show_leaderboard)
-            await broadcast_to_overlays(message)
+    def broadcast(self, message):
+        """Thread-safe overlay broadcast from the GUI"""
+        if not self.loop:
+            return
+        self.loop.call_soon_threadsafe(overlay_broadcaster.broadcast, message)
 
-        self.loop.call_soon_threadsafe(lambda: self.loop.create_task(_send()))
+    def update_config(self, config):
+        """Thread-safe config swap from the GUI; the game and its chat queue live on the bot loop"""
+        self.config = config
+        if not self.loop or not self.bot:
+            return
+        self.loop.call_soon_threadsafe(self.bot.game.update_config, copy.deepcopy(config))
         
     def run(self):
         try:
             self.loop = asyncio.new_event_loop()
             asyncio.set_event_loop(self.loop)
+
+            configure_runtime(self.config)
+
+            # Keep the item index current off the chat path
+            self.loop.create_task(asset_manager.watch())
             
             # Start overlay server
             overlay_task = self.loop.create_task(start_overlay_server(self.log))
             self.log("🍞 Overlay server started on ws://localhost:8765")
             
             # Start bot
-            self.bot = ChatCollectBot(self.token, self.channel, self.log, self.update_status, self.config)
-            self.bot.set_show_banner(self.show_banner)
+            game = ChannelGame(self.channel, self.config, db, overlay_broadcaster, self.log, self.update_status)
+            game.set_show_banner(self.show_banner)
+            self.bot = ChatCollectBot(self.token, [game], self.log)
             bot_task = self.loop.create_task(self.bot.start())
             
             # Initial Leaderboard
@@ -1550,8 +3058,446 @@ class BotThread(QThread):
             
     def stop(self):
         if self.loop:
+            # Commit pending journal records and compact before the loop goes away
+            if self.loop.is_running():
+                future = asyncio.run_coroutine_threadsafe(db.flush(), self.loop)
+                try:
+                    future.result(timeout=10)
+                except Exception as e:
+                    print(f"⚠️ Error flushing database: {e}")
+            asset_manager.stop_watching()
+            if self.loop.is_running():
+                self.loop.call_soon_threadsafe(overlay_broadcaster.reset)
+            else:
+                overlay_broadcaster.reset()
             self.loop.call_soon_threadsafe(self.loop.stop)
 
+# ============ HEADLESS MULTI-CHANNEL ============
+CHANNELS_FILE = os.path.join(BASE_PATH, "chatcollect_channels.json")
+CHANNELS_FOLDER = os.path.join(BASE_PATH, "channels")
+
+def load_profile(path):
+    """Config profile merged over DEFAULT_CONFIG (a missing file means all defaults)"""
+    config = copy.deepcopy(DEFAULT_CONFIG)
+    if os.path.exists(path):
+        with open(path, 'r', encoding='utf-8') as f:
+            loaded = json.load(f)
+        for key, value in loaded.items():
+            if key in ["commands", "messages", "events", "points"] and isinstance(value, dict):
+                config[key].update(value)
+            else:
+                config[key] = value
+    return config
+
+def load_channel_games(settings, log_callback=print):
+    """One ChannelGame per configured channel, each with its own profile, database and overlay.
+
+    settings["channels"] is a list of names, or a dict of name -> {"config": path, "database": path}.
+    Defaults: channels/<name>/chatcollect_config.json and channels/<name>/chatcollect_data.txt
+    """
+    entries = settings.get("channels", [])
+    if isinstance(entries, dict):
+        entries = list(entries.items())
+    else:
+        entries = [(name, {}) for name in entries]
+
+    games = []
+    for name, options in entries:
+        name = normalize_channel(name)
+        if not name:
+            continue
+        folder = os.path.join(CHANNELS_FOLDER, name)
+        config_path = os.path.join(BASE_PATH, options.get("config") or os.path.join(folder, "chatcollect_config.json"))
+        db_path = os.path.join(BASE_PATH, options.get("database") or os.path.join(folder, "chatcollect_data.txt"))
+        os.makedirs(os.path.dirname(db_path), exist_ok=True)
+
+        config = load_profile(config_path)
+        config['channel'] = name
+        database = PlayerDatabase(db_path)
+        overlay = OverlayBroadcaster(database=database)
+        configure_runtime(config, database, overlay)
+
+        game = ChannelGame(name, config, database, overlay, log_callback)
+        game.set_show_banner(config.get('show_banner', True))
+        games.append(game)
+        log_callback(f"📂 [{name}] {len(database.players)} players, profile {config_path}")
+    return games
+
+async def run_channels(settings, log_callback=print):
+    """Serve every configured channel from this process: one chat connection, one loop, one asset cache"""
+    games = load_channel_games(settings, log_callback)
+    if not games:
+        raise ValueError("No channels configured")
+
+    overlay_routes.clear()
+    for game in games:
+        overlay_routes[game.channel_name] = game.overlay
+        metrics.set_gauge("chatcollect_overlay_clients", lambda overlay=game.overlay: len(overlay.clients),
+                          channel=game.channel_name)
+        if game.rules.show_leaderboard:
+            game.overlay.publish_leaderboard(True)
+
+    host = settings.get("host", "0.0.0.0")
+    port = int(settings.get("port", 8765))
+    watch_task = asyncio.ensure_future(asset_manager.watch())
+    overlay_task = asyncio.ensure_future(start_overlay_server(log_callback, host, port))
+    log_callback(f"🍞 Overlay server started on ws://localhost:{port}/<channel> ({len(games)} channels)")
+
+    bot = ChatCollectBot(settings["token"], games, log_callback)
+    try:
+        await bot.start()
+    finally:
+        await bot.flush()
+        watch_task.cancel()
+        overlay_task.cancel()
+
+def run_headless(argv=None):
+    """Entry point: python chatcollect_gui.py --headless [--channels chatcollect_channels.json]"""
+    parser = argparse.ArgumentParser(description="Run ChatCollect for one or more channels without the GUI")
+    parser.add_argument("--headless", action="store_true")
+    parser.add_argument("--channels", default=CHANNELS_FILE, help="Channel list (default: chatcollect_channels.json)")
+    args = parser.parse_args(argv)
+
+    try:
+        with open(args.channels, 'r', encoding='utf-8') as f:
+            settings = json.load(f)
+    except Exception as e:
+        print(f"❌ Could not read {args.channels}: {e}")
+        return 1
+
+    if not settings.get("token"):
+        # Fall back to the GUI's saved token
+        settings["token"] = load_profile(CONFIG_FILE).get("token", "")
+    if not settings.get("token"):
+        print("❌ No OAuth token in the channel file or chatcollect_config.json")
+        return 1
+
+    # Each channel opens its own database; only the shared item index is needed
+    init_managers(db_path=None)
+    try:
+        asyncio.run(run_channels(settings))
+    except KeyboardInterrupt:
+        print("🛑 Stopped")
+    return 0
+
+# ============ BALANCE SIMULATOR ============
+def loot_pool(index=None):
+    """(legendary_share, has_legendary) of the overlay folder, as choose_loot_item sees it"""
+    index = asset_manager.index if index is None else index
+    return index.legendary_share, bool(index.legendary_table)
+
+def roll_loot(rules, luck, rng, legendary_share=0.0, has_legendary=False):
+    """cmd_loot's rolls for many loots at once (numpy).
+
+    luck holds each looter's luck. Returns arrays (rarity, points, legendary, steal):
+    rarity indexes RARITIES, steal is the steal_chance roll (a thief still has to exist).
+    """
+    luck = np.asarray(luck, dtype=float)
+    n = luck.size
+
+    # cmd_loot's own thresholds (plain arithmetic, so it works on arrays);
+    # bisect_right == count of thresholds <= roll
+    shiny, ruined, golden = rules.rarity_table(luck)
+    roll = rng.random(n)
+    rarity = (roll >= shiny).astype(np.int8) + (roll >= ruined) + (roll >= golden)
+
+    pts = rules.points
+    points = np.array([pts["shiny"], pts["ruined"], pts["golden"], 0], dtype=np.int64)[rarity]
+    standard = rarity == 3
+    points[standard] = rng.integers(rules.standard_min, rules.standard_max + 1, size=int(standard.sum()))
+
+    # Shiny draws from both pools by weight, everything else from the legendary pool at 1 in X
+    item_roll = rng.random(n)
+    legendary = np.where(rarity == 0, item_roll < legendary_share,
+                         has_legendary & (item_roll < rules.legendary_prob))
+    points = np.where(legendary, np.maximum(points, pts["legendary"]), points)
+
+    steal = rng.random(n) < rules.steal_chance
+    return rarity, points, legendary, steal
+
+def _simulate_season(rules, players, hours, wait, users, use_amount, rush, drive, pool, rng):
+    """One simulated season; returns the raw per-player arrays and totals"""
+    legendary_share, has_legendary = pool
+    rush_every, rush_seconds = rush
+    drive_every, drive_seconds = drive
+
+    # Tick on a grid that hits both the normal and the Rush Hour cooldown exactly
+    tick = math.gcd(rules.cooldown, rules.rush_cooldown) if rush_every else rules.cooldown
+    tick = max(1, tick)
+    ticks = int(hours * 3600 // tick)
+    # Chance that an off-cooldown player types the command during one tick.
+    # Counting the tick they come off cooldown, the wait is geometric with
+    # mean tick * (1 - p) / p, which equals wait for this p
+    act_prob = tick / (wait + tick)
+
+    score = np.zeros(players, dtype=np.int64)
+    luck = np.zeros(players)
+    shinies = np.zeros(players, dtype=np.int64)
+    last_loot = np.full(players, -np.inf)
+    last_use = np.full(players, -np.inf)
+    looted = np.zeros(players, dtype=bool)
+    pool_idx = np.zeros(0, dtype=np.int64)
+    thresholds = np.array([s for s in rules.rank_scores if s > 0], dtype=np.int64)
+    reached = np.full((players, thresholds.size), np.nan)
+
+    totals = {
+        "loots": 0, "rarity": np.zeros(4, dtype=np.int64), "legendary": 0,
+        "steals": 0, "stolen_points": 0, "points": 0, "uses": 0, "spent": 0,
+        "drives": 0, "drives_completed": 0, "drive_seconds": []
+    }
+    drive_count = 0
+    drive_done = True
+    phase = 0
+
+    for k in range(ticks):
+        now = k * tick
+        rush_active = rush_every and now >= rush_every and now % rush_every < rush_seconds
+        drive_active = False
+        if drive_every and now >= drive_every:
+            phase = now % drive_every
+            if phase < tick:
+                # A new Loot Drive starts on this tick
+                totals["drives"] += 1
+                drive_count = 0
+                drive_done = False
+            drive_active = phase < drive_seconds and not drive_done
+
+        cooldown = rules.rush_cooldown if rush_active else rules.cooldown
+        ready = (now - last_loot) >= cooldown
+        looters = np.flatnonzero(ready & (rng.random(players) < act_prob))
+        if not looters.size:
+            continue
+
+        # !use right before the loot, when allowed
+        spenders = looters[users[looters] & ((now - last_use[looters]) >= rules.use_cooldown)
+                           & (score[looters] >= use_amount)]
+        if spenders.size:
+            score[spenders] -= use_amount
+            luck[spenders] += use_amount * rules.luck_per_point
+            last_use[spenders] = now
+            totals["uses"] += spenders.size
+            totals["spent"] += spenders.size * use_amount
+
+        new = looters[~looted[looters]]
+        if new.size:
+            looted[new] = True
+            pool_idx = np.flatnonzero(looted)
+
+        rarity, points, legendary, steal = roll_loot(rules, luck[looters], rng, legendary_share, has_legendary)
+        luck[looters] = 0.0
+        shinies[looters] += rarity == 0
+        last_loot[looters] = now
+        if pool_idx.size < 2:
+            steal[:] = False
+
+        gain = np.where(steal, 0, points)
+        score[looters] += gain
+        touched = looters
+        if steal.any():
+            victims = looters[steal]
+            # DatabaseRanking.random_other: uniform over everyone else in the database
+            pick = rng.integers(0, pool_idx.size - 1, size=victims.size)
+            pick += pick >= np.searchsorted(pool_idx, victims)
+            thieves = pool_idx[pick]
+            np.add.at(score, thieves, points[steal])
+            totals["steals"] += victims.size
+            totals["stolen_points"] += int(points[steal].sum())
+            touched = np.concatenate([looters, thieves])
+
+        if thresholds.size:
+            hit = (score[touched, None] >= thresholds) & np.isnan(reached[touched])
+            rows, cols = np.nonzero(hit)
+            reached[touched[rows], cols] = now
+
+        totals["loots"] += looters.size
+        totals["rarity"] += np.bincount(rarity, minlength=4)
+        totals["legendary"] += int(legendary.sum())
+        totals["points"] += int(points.sum())
+
+        if drive_active:
+            drive_count += looters.size
+            if drive_count >= rules.loot_drive_target:
+                drive_done = True
+                totals["drives_completed"] += 1
+                totals["drive_seconds"].append(phase + tick)
+
+    return {"score": score, "shinies": shinies, "reached": reached, "looted": looted,
+            "thresholds": thresholds, "totals": totals, "tick": tick, "ticks": ticks}
+
+def _distribution(values):
+    if not values.size:
+        return {"mean": 0.0, "p10": 0, "p25": 0, "p50": 0, "p75": 0, "p90": 0, "p99": 0, "max": 0}
+    p10, p25, p50, p75, p90, p99 = np.percentile(values, [10, 25, 50, 75, 90, 99])
+    return {"mean": round(float(values.mean()), 2), "p10": round(float(p10), 1), "p25": round(float(p25), 1),
+            "p50": round(float(p50), 1), "p75": round(float(p75), 1), "p90": round(float(p90), 1),
+            "p99": round(float(p99), 1), "max": int(values.max())}
+
+def _top_share(values, fraction=0.1):
+    """Share of all points held by the top fraction of players"""
+    total = values.sum()
+    if total <= 0:
+        return 0.0
+    top = max(1, int(values.size * fraction))
+    return float(np.sort(values)[-top:].sum() / total)
+
+def simulate_balance(config, players=1000, hours=4.0, mean_wait=120.0, use_share=0.2, use_amount=1,
+                     rush_every=0, rush_minutes=2, drive_every=0, drive_minutes=20,
+                     pool=None, compare_steals=True, seed=None):
+    """Monte Carlo season of the loot economy for config, vectorized over players.
+
+    Players loot mean_wait seconds (exponential, a different average per player)
+    after their cooldown ends; use_share of them !use use_amount before each loot
+    when off cooldown. rush_every/drive_every (minutes, 0 = never) start Rush Hour
+    and a Loot Drive on a fixed schedule. Contests and the Bounty Hunter are not
+    simulated. Returns a plain dict; format_balance_report() renders it.
+    """
+    if np is None:
+        raise RuntimeError("The balance simulator needs numpy (pip install numpy)")
+
+    started = time.perf_counter()
+    rules = LootRules(config)
+    pool = loot_pool() if pool is None else pool
+    rng = np.random.default_rng(seed)
+
+    players = max(1, int(players))
+    wait = rng.exponential(max(0.1, float(mean_wait)), size=players) + 0.1
+    users = rng.random(players) < use_share
+    rush = (int(rush_every * 60), int(rush_minutes * 60))
+    drive = (int(drive_every * 60), int(drive_minutes * 60))
+    use_amount = max(1, int(use_amount))
+
+    run = _simulate_season(rules, players, hours, wait, users, use_amount, rush, drive, pool, rng)
+    totals = run["totals"]
+    loots = max(1, totals["loots"])
+    score = run["score"][run["looted"]]
+
+    ranks = []
+    thresholds = list(run["thresholds"])
+    for title, min_score in zip(rules.rank_titles, rules.rank_scores):
+        if min_score <= 0:
+            ranks.append({"title": title, "score": min_score, "reached": score.size / players,
+                          "median_hours": 0.0, "p90_hours": 0.0})
+            continue
+        times = run["reached"][:, thresholds.index(min_score)]
+        times = times[~np.isnan(times)] / 3600.0
+        ranks.append({
+            "title": title,
+            "score": min_score,
+            "reached": times.size / players,
+            "median_hours": round(float(np.median(times)), 2) if times.size else None,
+            "p90_hours": round(float(np.percentile(times, 90)), 2) if times.size else None
+        })
+    final_rank = np.searchsorted(rules.rank_scores, score, side="right") - 1 if rules.rank_scores else np.zeros(0, dtype=np.int64)
+    holders = np.bincount(np.maximum(final_rank, 0), minlength=len(rules.rank_titles)) if score.size else []
+    for entry, count in zip(ranks, holders):
+        entry["holders"] = int(count)
+
+    report = {
+        "params": {
+            "players": players, "hours": hours, "mean_wait": mean_wait, "use_share": use_share,
+            "use_amount": use_amount, "rush_every": rush_every, "rush_minutes": rush_minutes,
+            "drive_every": drive_every, "drive_minutes": drive_minutes,
+            "legendary_share": round(pool[0], 4), "legendary_pool": pool[1],
+            "tick_seconds": run["tick"], "seed": seed
+        },
+        "loots": totals["loots"],
+        "active_players": int(run["looted"].sum()),
+        "loots_per_player_hour": round(totals["loots"] / players / hours, 2) if hours else 0.0,
+        "rarity": {name: round(int(totals["rarity"][i]) / loots, 5) for i, name in enumerate(RARITIES)},
+        "legendary_rate": round(totals["legendary"] / loots, 5),
+        "players_with_shiny": round(float((run["shinies"] > 0).mean()), 4),
+        "points_per_loot": round(totals["points"] / loots, 3),
+        "uses": totals["uses"],
+        "points_spent": totals["spent"],
+        "score": _distribution(score),
+        "top10_share": round(_top_share(score), 4),
+        "ranks": ranks,
+        "steals": {
+            "count": totals["steals"],
+            "rate": round(totals["steals"] / loots, 5),
+            "points": totals["stolen_points"],
+            "share_of_points": round(totals["stolen_points"] / max(1, totals["points"]), 4)
+        },
+        "loot_drive": {
+            "target": rules.loot_drive_target,
+            "started": totals["drives"],
+            "completed": totals["drives_completed"],
+            "median_minutes": round(float(np.median(totals["drive_seconds"])) / 60.0, 1) if totals["drive_seconds"] else None
+        }
+    }
+
+    if compare_steals and rules.steal_chance > 0:
+        # Same season without steals, to see what they do to the spread of scores
+        no_steal = LootRules(dict(config, steal_chance=0))
+        baseline = _simulate_season(no_steal, players, hours, wait, users, use_amount, rush, drive, pool,
+                                    np.random.default_rng(None if seed is None else seed + 1))
+        base_score = baseline["score"][baseline["looted"]]
+        report["steals"]["without"] = {
+            "score": _distribution(base_score),
+            "top10_share": round(_top_share(base_score), 4)
+        }
+
+    report["elapsed_s"] = round(time.perf_counter() - started, 3)
+    return report
+
+def format_balance_report(report):
+    """Plain-text summary of a simulate_balance() result"""
+    p = report["params"]
+
+    def pct(value):
+        return f"{value * 100:.3g}%"
+
+    lines = [
+        f"👥 {p['players']} players, {p['hours']:g}h stream, ~{p['mean_wait']:g}s wait after cooldown, "
+        f"{pct(p['use_share'])} use !use {p['use_amount']}",
+        f"🎲 {report['loots']:,} loots ({report['loots_per_player_hour']}/player/hour) in {report['elapsed_s']}s",
+        "",
+        "Rarity: " + ", ".join(f"{name} {pct(rate)}" for name, rate in report["rarity"].items()),
+        f"Legendary: {pct(report['legendary_rate'])} of loots | Players with a shiny: {pct(report['players_with_shiny'])}",
+        f"Points per loot: {report['points_per_loot']} | !use: {report['uses']:,} times, {report['points_spent']:,} pts spent",
+        ""
+    ]
+    s = report["score"]
+    lines.append(f"Score: median {s['p50']:g}, p90 {s['p90']:g}, p99 {s['p99']:g}, max {s['max']} "
+                 f"(top 10% hold {pct(report['top10_share'])})")
+    lines.append("")
+    lines.append("Rank                      Reached   Median   p90     Holders")
+    for r in report["ranks"]:
+        median = "-" if r["median_hours"] is None else f"{r['median_hours']:g}h"
+        p90 = "-" if r["p90_hours"] is None else f"{r['p90_hours']:g}h"
+        lines.append(f"{r['title'][:24]:<25} {pct(r['reached']):>7}   {median:>6}   {p90:>6}  {r.get('holders', 0):>6}")
+
+    st = report["steals"]
+    lines.append("")
+    lines.append(f"😈 Steals: {st['count']:,} ({pct(st['rate'])} of loots), {st['points']:,} pts moved "
+                 f"({pct(st['share_of_points'])} of all points)")
+    if "without" in st:
+        w = st["without"]
+        lines.append(f"   Without steals: median {w['score']['p50']:g}, p90 {w['score']['p90']:g}, "
+                     f"top 10% hold {pct(w['top10_share'])}")
+
+    d = report["loot_drive"]
+    if d["started"]:
+        median = "" if d["median_minutes"] is None else f", median {d['median_minutes']:g} min to finish"
+        lines.append(f"🎒 Loot Drives: {d['completed']}/{d['started']} reached {d['target']} items{median}")
+    return "\n".join(lines)
+
+class SimulationThread(QThread):
+    """Runs simulate_balance off the GUI thread"""
+    result_signal = pyqtSignal(str)
+
+    def __init__(self, config, **options):
+        super().__init__()
+        self.config = config
+        self.options = options
+
+    def run(self):
+        try:
+            report = simulate_balance(self.config, **self.options)
+            self.result_signal.emit(format_balance_report(report))
+        except Exception as e:
+            self.result_signal.emit(f"❌ Simulation failed: {e}")
+
 # ============ CUSTOM WIDGETS ============
 class ToggleSwitch(QCheckBox):
     def __init__(self, text="", parent=None):
@@ -2157,6 +4103,12 @@ class ChatCollectGUI(QMainWindow):
         channel_layout.addWidget(self.channel_input)
         config_layout.addLayout(channel_layout)
 
+        # Chat rate limit (Twitch allows mods 100 messages/30s instead of 20)
+        self.chat_mod_cb = ToggleSwitch("Bot Account is a Moderator")
+        self.chat_mod_cb.setChecked(self.config.get('chat_is_moderator', False))
+        self.chat_mod_cb.stateChanged.connect(self.save_settings_change)
+        config_layout.addWidget(self.chat_mod_cb)
+
         # Save Config Button
         self.save_config_btn = QPushButton("💾 Save Configuration")
         self.save_config_btn.setObjectName("saveBtn")
@@ -2378,6 +4330,24 @@ class ChatCollectGUI(QMainWindow):
 
         status_group.setLayout(status_layout)
         layout.addWidget(status_group)
+
+        # Live Stats (same numbers as http://localhost:8765/metrics)
+        stats_group = QGroupBox("Live Stats")
+        stats_layout = QGridLayout()
+        self.stats_labels = {}
+        for i, (key, title) in enumerate([("commands", "Commands"), ("database", "Database"),
+                                          ("overlay", "Overlay"), ("chat", "Chat"), ("loop", "Event Loop")]):
+            stats_layout.addWidget(QLabel(title), 0, i)
+            label = QLabel("-")
+            label.setObjectName("statusLabel")
+            stats_layout.addWidget(label, 1, i)
+            self.stats_labels[key] = label
+        stats_group.setLayout(stats_layout)
+        layout.addWidget(stats_group)
+
+        self.stats_timer = QTimer(self)
+        self.stats_timer.timeout.connect(self.update_live_stats)
+        self.stats_timer.start(1000)
         
         # Log Display
         log_group = QGroupBox("Activity Log")
@@ -2659,11 +4629,92 @@ class ChatCollectGUI(QMainWindow):
         points_group.setLayout(points_layout)
         balance_layout.addWidget(points_group)
         
+        # Balance Simulator (runs the current settings, nothing is saved)
+        sim_group = QGroupBox("Balance Simulator")
+        sim_layout = QGridLayout()
+        
+        sim_layout.addWidget(QLabel("Players:"), 0, 0)
+        self.sim_players_spin = QSpinBox()
+        self.sim_players_spin.setRange(1, 100000)
+        self.sim_players_spin.setValue(1000)
+        sim_layout.addWidget(self.sim_players_spin, 0, 1)
+        
+        sim_layout.addWidget(QLabel("Stream Hours:"), 0, 2)
+        self.sim_hours_spin = QSpinBox()
+        self.sim_hours_spin.setRange(1, 500)
+        self.sim_hours_spin.setValue(20)
+        sim_layout.addWidget(self.sim_hours_spin, 0, 3)
+        
+        sim_layout.addWidget(QLabel("Avg. Wait After Cooldown (s):"), 1, 0)
+        self.sim_wait_spin = QSpinBox()
+        self.sim_wait_spin.setRange(1, 36000)
+        self.sim_wait_spin.setValue(120)
+        sim_layout.addWidget(self.sim_wait_spin, 1, 1)
+        
+        sim_layout.addWidget(QLabel("Players Using !use:"), 1, 2)
+        self.sim_use_spin = QSpinBox()
+        self.sim_use_spin.setRange(0, 100)
+        self.sim_use_spin.setSuffix("%")
+        self.sim_use_spin.setValue(20)
+        sim_layout.addWidget(self.sim_use_spin, 1, 3)
+        
+        sim_layout.addWidget(QLabel("Rush Hour Every (min, 0 = never):"), 2, 0)
+        self.sim_rush_spin = QSpinBox()
+        self.sim_rush_spin.setRange(0, 1440)
+        self.sim_rush_spin.setValue(0)
+        sim_layout.addWidget(self.sim_rush_spin, 2, 1)
+        
+        sim_layout.addWidget(QLabel("Loot Drive Every (min, 0 = never):"), 2, 2)
+        self.sim_drive_spin = QSpinBox()
+        self.sim_drive_spin.setRange(0, 1440)
+        self.sim_drive_spin.setValue(0)
+        sim_layout.addWidget(self.sim_drive_spin, 2, 3)
+        
+        self.sim_run_btn = QPushButton("▶ Run Simulation")
+        self.sim_run_btn.clicked.connect(self.run_balance_simulation)
+        sim_layout.addWidget(self.sim_run_btn, 3, 0, 1, 4)
+        
+        self.sim_output = QTextEdit()
+        self.sim_output.setReadOnly(True)
+        self.sim_output.setFont(QFont("Consolas", 9))
+        self.sim_output.setMinimumHeight(260)
+        self.sim_output.setPlaceholderText("Simulates a stream with the settings above: score spread, time to each rank, shiny/legendary rates and steals.")
+        sim_layout.addWidget(self.sim_output, 4, 0, 1, 4)
+        
+        sim_group.setLayout(sim_layout)
+        balance_layout.addWidget(sim_group)
+        self.sim_thread = None
+        
         balance_layout.addStretch()
         
         balance_tab.setLayout(balance_layout)
         self.setup_tabs.addTab(balance_tab, "⚖️ Balance")
 
+    def run_balance_simulation(self):
+        if np is None:
+            QMessageBox.warning(self, "numpy Missing", "The balance simulator needs numpy.\n\nInstall it with: pip install numpy")
+            return
+        if self.sim_thread and self.sim_thread.isRunning():
+            return
+        
+        self.sim_run_btn.setEnabled(False)
+        self.sim_output.setPlainText("⏳ Simulating...")
+        self.sim_thread = SimulationThread(
+            copy.deepcopy(self.config),
+            players=self.sim_players_spin.value(),
+            hours=self.sim_hours_spin.value(),
+            mean_wait=self.sim_wait_spin.value(),
+            use_share=self.sim_use_spin.value() / 100.0,
+            rush_every=self.sim_rush_spin.value(),
+            drive_every=self.sim_drive_spin.value()
+        )
+        self.sim_thread.result_signal.connect(self.show_simulation_result)
+        self.sim_thread.start()
+    
+    def show_simulation_result(self, text):
+        self.sim_output.setPlainText(text)
+        self.sim_run_btn.setEnabled(True)
+
     def add_config_input(self, layout, category, key, label_text):
         layout.addRow(QLabel(label_text))
         input_field = QLineEdit()
@@ -2778,6 +4829,15 @@ class ChatCollectGUI(QMainWindow):
         self.autosave_spin.setValue(self.config.get('autosave_interval', 5))
         self.autosave_spin.valueChanged.connect(self.save_settings_change)
         data_layout.addWidget(self.autosave_spin, 1, 1)
+
+        # Save Batch Window (group commit)
+        data_layout.addWidget(QLabel("Save Batch Window (ms):"), 2, 0)
+        self.commit_window_spin = QSpinBox()
+        self.commit_window_spin.setRange(0, 5000)
+        self.commit_window_spin.setSingleStep(50)
+        self.commit_window_spin.setValue(int(self.config.get('save_commit_window_ms', 250)))
+        self.commit_window_spin.valueChanged.connect(self.save_settings_change)
+        data_layout.addWidget(self.commit_window_spin, 2, 1)
         
         data_group.setLayout(data_layout)
         layout.addWidget(data_group)
@@ -3084,6 +5144,10 @@ class ChatCollectGUI(QMainWindow):
             
             # Refresh UI
             self.refresh_ui_from_config()
+
+            # Swap the running bot over to the new rules
+            if self.bot_thread and self.bot_thread.bot:
+                self.bot_thread.update_config(self.config)
             
             self.log(f"✅ Configuration loaded from: {file_path}")
             self.toast.show_message("✅ Configuration Loaded!")
@@ -3101,6 +5165,7 @@ class ChatCollectGUI(QMainWindow):
         # Tab 1: Collection
         self.token_input.setText(self.config.get('token', ''))
         self.channel_input.setText(self.config.get('channel', ''))
+        self.chat_mod_cb.setChecked(self.config.get('chat_is_moderator', False))
         self.show_banner_cb.setChecked(self.config.get('show_banner', True))
         self.show_leaderboard_cb.setChecked(self.config.get('show_leaderboard', False))
         
@@ -3145,6 +5210,7 @@ class ChatCollectGUI(QMainWindow):
         self.font_size_spin.setValue(self.config.get('font_size', 11))
         self.output_dir_input.setText(self.config.get('output_dir', os.getcwd()))
         self.autosave_spin.setValue(self.config.get('autosave_interval', 5))
+        self.commit_window_spin.setValue(int(self.config.get('save_commit_window_ms', 250)))
         
         # Apply Theme/Font
         self.apply_theme(self.config.get('theme', 'Dark Mode'))
@@ -3170,6 +5236,7 @@ class ChatCollectGUI(QMainWindow):
         # Update current config with UI values
         self.config['token'] = self.token_input.text()
         self.config['channel'] = self.channel_input.text()
+        self.config['chat_is_moderator'] = self.chat_mod_cb.isChecked()
         self.config['show_banner'] = self.show_banner_cb.isChecked()
         
         # New Settings
@@ -3178,6 +5245,7 @@ class ChatCollectGUI(QMainWindow):
         self.config['font_size'] = self.font_size_spin.value()
         self.config['output_dir'] = self.output_dir_input.text()
         self.config['autosave_interval'] = self.autosave_spin.value()
+        self.config['save_commit_window_ms'] = self.commit_window_spin.value()
         
         # Game Balance
         self.config['cooldown'] = self.cooldown_spin.value()
@@ -3220,7 +5288,11 @@ class ChatCollectGUI(QMainWindow):
             
             # Update running bot config
             if self.bot_thread and self.bot_thread.bot:
-                self.bot_thread.bot.config = self.config
+                self.bot_thread.update_config(self.config)
+                db.configure(
+                    commit_window=self.config['save_commit_window_ms'] / 1000.0,
+                    compact_interval=self.config['autosave_interval'] * 60
+                )
                 self.log("🔄 Bot configuration updated live!")
             
             # Update UI Labels
@@ -3318,6 +5390,49 @@ class ChatCollectGUI(QMainWindow):
             self.bo_status_label.setText("Inactive")
             self.bo_status_label.setStyleSheet("color: #888;")
         
+    def update_live_stats(self):
+        """Refresh the Live Stats panel from the metrics registry"""
+        def ms(seconds):
+            if seconds is None:
+                return "-"
+            if seconds == float("inf"):
+                return ">10s"
+            return f"≤{seconds * 1000:g}ms"
+
+        def p95(name, **labels):
+            histogram = metrics.histogram(name, **labels)
+            return ms(histogram.quantile(0.95) if histogram else None)
+
+        handled = 0
+        for command in ("loot", "use", "contest", "leaderboard"):
+            histogram = metrics.histogram("chatcollect_command_duration_seconds", command=command)
+            if histogram:
+                handled += histogram.count
+        loot = metrics.histogram("chatcollect_command_duration_seconds", command="loot")
+        self.stats_labels["commands"].setText(
+            f"{handled} handled\n!loot p95 {ms(loot.quantile(0.95) if loot else None)}")
+
+        written = (metrics.counter("chatcollect_db_bytes_written_total", kind="journal") +
+                   metrics.counter("chatcollect_db_bytes_written_total", kind="snapshot"))
+        self.stats_labels["database"].setText(
+            f"{metrics.gauge('chatcollect_db_players')} players, {written / 1024:.0f} KB written\n"
+            f"journal p95 {p95('chatcollect_db_write_seconds', kind='journal')}")
+
+        dropped = (metrics.counter("chatcollect_overlay_dropped_total", reason="queue_full") +
+                   metrics.counter("chatcollect_overlay_dropped_total", reason="late"))
+        self.stats_labels["overlay"].setText(
+            f"{metrics.gauge('chatcollect_overlay_clients')} clients, {dropped} dropped\n"
+            f"fan-out p95 {p95('chatcollect_overlay_broadcast_seconds')}")
+
+        self.stats_labels["chat"].setText(
+            f"{metrics.counter('chatcollect_chat_messages_total', result='sent')} sent, "
+            f"{metrics.gauge_total('chatcollect_chat_queue')} queued\n"
+            f"send p95 {p95('chatcollect_chat_send_seconds')}")
+
+        self.stats_labels["loop"].setText(
+            f"tick lag p95 {p95('chatcollect_game_loop_lag_seconds')}\n"
+            f"asset scan p95 {p95('chatcollect_asset_scan_seconds')}")
+
     def test_custom_bake(self):
         rarity_text = self.rarity_combo.currentText().lower()
         item_filename = self.item_combo.currentData()
@@ -3353,7 +5468,8 @@ class ChatCollectGUI(QMainWindow):
         else:
              message["trigger_explosion"] = False
 
-        asyncio.run(broadcast_to_overlays(message))
+        if self.bot_thread:
+            self.bot_thread.broadcast(message)
         self.log(f"🧪 Custom Test: {rarity_text.upper()} {format_item_name(item_filename)}")
 
     def test_explosion(self):
@@ -3374,7 +5490,8 @@ class ChatCollectGUI(QMainWindow):
             "show_banner": self.show_banner_cb.isChecked()
         }
         
-        asyncio.run(broadcast_to_overlays(message))
+        if self.bot_thread:
+            self.bot_thread.broadcast(message)
         self.log(f"💥 TEST EXPLOSION: {item_display_name}")
     
     def test_legendary(self):
@@ -3402,7 +5519,8 @@ class ChatCollectGUI(QMainWindow):
             "show_banner": self.show_banner_cb.isChecked()
         }
         
-        asyncio.run(broadcast_to_overlays(message))
+        if self.bot_thread:
+            self.bot_thread.broadcast(message)
         self.log(f"✨ TEST LEGENDARY: {item_display_name} ✨")
         
     def log(self, message):
@@ -3440,7 +5558,7 @@ class ChatCollectGUI(QMainWindow):
                 duration = int(self.rh_duration.text())
             except ValueError:
                 duration = 2
-            asyncio.run_coroutine_threadsafe(self.bot_thread.bot.start_rush_hour(duration), self.bot_thread.loop)
+            asyncio.run_coroutine_threadsafe(self.bot_thread.bot.game.start_rush_hour(duration), self.bot_thread.loop)
             evts = self.config.get("events", DEFAULT_CONFIG["events"])
             self.log(f"🚀 Triggered {evts['rush_hour_name']} ({duration} mins)!")
         else:
@@ -3448,7 +5566,7 @@ class ChatCollectGUI(QMainWindow):
 
     def stop_rush_hour(self):
         if self.bot_thread and self.bot_thread.bot:
-            asyncio.run_coroutine_threadsafe(self.bot_thread.bot.stop_rush_hour(), self.bot_thread.loop)
+            asyncio.run_coroutine_threadsafe(self.bot_thread.bot.game.stop_rush_hour(), self.bot_thread.loop)
             evts = self.config.get("events", DEFAULT_CONFIG["events"])
             self.log(f"🛑 Stopped {evts['rush_hour_name']}!")
 
@@ -3458,7 +5576,7 @@ class ChatCollectGUI(QMainWindow):
                 duration = int(self.bs_duration.text())
             except ValueError:
                 duration = 20
-            asyncio.run_coroutine_threadsafe(self.bot_thread.bot.start_loot_drive(duration), self.bot_thread.loop)
+            asyncio.run_coroutine_threadsafe(self.bot_thread.bot.game.start_loot_drive(duration), self.bot_thread.loop)
             evts = self.config.get("events", DEFAULT_CONFIG["events"])
             self.log(f"🍪 Triggered {evts['loot_drive_name']} ({duration} mins)!")
         else:
@@ -3466,7 +5584,7 @@ class ChatCollectGUI(QMainWindow):
 
     def stop_loot_drive(self):
         if self.bot_thread and self.bot_thread.bot:
-            asyncio.run_coroutine_threadsafe(self.bot_thread.bot.stop_loot_drive(), self.bot_thread.loop)
+            asyncio.run_coroutine_threadsafe(self.bot_thread.bot.game.stop_loot_drive(), self.bot_thread.loop)
             evts = self.config.get("events", DEFAULT_CONFIG["events"])
             self.log(f"🛑 Stopped {evts['loot_drive_name']}!")
 
@@ -3476,7 +5594,7 @@ class ChatCollectGUI(QMainWindow):
                 duration = int(self.fc_duration.text())
             except ValueError:
                 duration = 10
-            asyncio.run_coroutine_threadsafe(self.bot_thread.bot.spawn_bounty_hunter(duration), self.bot_thread.loop)
+            asyncio.run_coroutine_threadsafe(self.bot_thread.bot.game.spawn_bounty_hunter(duration), self.bot_thread.loop)
             evts = self.config.get("events", DEFAULT_CONFIG["events"])
             self.log(f"🧐 Triggered {evts['bounty_hunter_name']} ({duration} mins)!")
         else:
@@ -3484,7 +5602,7 @@ class ChatCollectGUI(QMainWindow):
 
     def stop_bounty_hunter(self):
         if self.bot_thread and self.bot_thread.bot:
-            asyncio.run_coroutine_threadsafe(self.bot_thread.bot.stop_bounty_hunter(), self.bot_thread.loop)
+            asyncio.run_coroutine_threadsafe(self.bot_thread.bot.game.stop_bounty_hunter(), self.bot_thread.loop)
             evts = self.config.get("events", DEFAULT_CONFIG["events"])
             self.log(f"🛑 Stopped {evts['bounty_hunter_name']}!")
 
@@ -3494,7 +5612,7 @@ class ChatCollectGUI(QMainWindow):
                 duration = int(self.bo_duration.text())
             except ValueError:
                 duration = 2
-            asyncio.run_coroutine_threadsafe(self.bot_thread.bot.start_contest(duration), self.bot_thread.loop)
+            asyncio.run_coroutine_threadsafe(self.bot_thread.bot.game.start_contest(duration), self.bot_thread.loop)
             evts = self.config.get("events", DEFAULT_CONFIG["events"])
             self.log(f"⚔️ Triggered {evts['contest_name']} ({duration} mins)!")
         else:
@@ -3502,12 +5620,15 @@ class ChatCollectGUI(QMainWindow):
 
     def stop_contest(self):
         if self.bot_thread and self.bot_thread.bot:
-            asyncio.run_coroutine_threadsafe(self.bot_thread.bot.stop_contest(), self.bot_thread.loop)
+            asyncio.run_coroutine_threadsafe(self.bot_thread.bot.game.stop_contest(), self.bot_thread.loop)
             evts = self.config.get("events", DEFAULT_CONFIG["events"])
             self.log(f"🛑 Stopped {evts['contest_name']}!")
 
 if __name__ == "__main__":
     ensure_initial_setup()
+    if "--headless" in sys.argv[1:]:
+        sys.exit(run_headless(sys.argv[1:]))
+    init_managers()
     app = QApplication(sys.argv)
     window = ChatCollectGUI()
     window.show()